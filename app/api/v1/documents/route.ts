@@ -7,9 +7,9 @@ export async function GET() {
   const items = await listDocuments()
   return NextResponse.json({
     items,
-    total: items.length,
-    skip: 0,
+    next_cursor: null,
     limit: 20,
+    total: items.length,
   })
 }
 
@@ -6,8 +6,10 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from jose import JWTError, jwt
+import time
 
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_db, get_replica_db, read_session, replicas
+from app.core.cache import get_cached, set_cached
 from app.core.config import settings
 from app.models.user import User
 
@@ -16,25 +18,25 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_replica_db),
 ) -> User:
-    """Get current authenticated user"""
+    """Get current authenticated user (looked up on a replica)"""
     # Dev-mode shortcut: allow requests without auth and auto-provision a demo user.
     if settings.DEV_MODE and not token:
-        result = await db.execute(select(User).where(User.username == settings.DEV_USERNAME))
-        user = result.scalar_one_or_none()
+        user = await _find_user(db, User.username == settings.DEV_USERNAME)
         if user is None:
-            user = User(
-                email=settings.DEV_USER_EMAIL,
-                username=settings.DEV_USERNAME,
-                hashed_password="dev",
-                full_name="Demo User",
-                is_active=True,
-                is_superuser=True,
-            )
-            db.add(user)
-            await db.commit()
-            await db.refresh(user)
+            async with AsyncSessionLocal() as write_db:
+                user = User(
+                    email=settings.DEV_USER_EMAIL,
+                    username=settings.DEV_USERNAME,
+                    hashed_password="dev",
+                    full_name="Demo User",
+                    is_active=True,
+                    is_superuser=True,
+                )
+                write_db.add(user)
+                await write_db.commit()
+                await write_db.refresh(user)
         return user
 
     credentials_exception = HTTPException(
@@ -51,8 +53,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await _find_user(db, User.id == user_id)
     
     if user is None:
         raise credentials_exception
@@ -61,3 +62,45 @@ async def get_current_user(
         raise HTTPException(status_code=403, detail="Inactive user")
     
     return user
+
+
+async def _find_user(db: AsyncSession, condition) -> User | None:
+    """User lookup, retried on the primary if a lagging replica hasn't got it yet"""
+    user = (await db.execute(select(User).where(condition))).scalar_one_or_none()
+    if user is None and replicas.enabled:
+        async with AsyncSessionLocal() as primary:
+            user = (await primary.execute(select(User).where(condition))).scalar_one_or_none()
+    return user
+
+
+# Users who wrote recently, for read-your-writes (shared via Redis when available)
+_recent_writes: dict[str, float] = {}
+
+
+async def mark_recent_write(user_id: str):
+    """Route the user's reads to the primary for READ_YOUR_WRITES_SECONDS"""
+    if not replicas.enabled:
+        return
+    _recent_writes[user_id] = time.monotonic() + settings.READ_YOUR_WRITES_SECONDS
+    await set_cached(f"rw:{user_id}", 1, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+async def _wrote_recently(user_id: str) -> bool:
+    until = _recent_writes.get(user_id)
+    if until is not None:
+        if until > time.monotonic():
+            return True
+        del _recent_writes[user_id]
+    return await get_cached(f"rw:{user_id}") is not None
+
+
+async def get_read_db(
+    current_user: User = Depends(get_current_user),
+    primary: AsyncSession = Depends(get_db),
+) -> AsyncSession:
+    """Read-only session: a replica, or the primary right after this user wrote"""
+    if not replicas.enabled or await _wrote_recently(current_user.id):
+        yield primary
+        return
+    async with read_session() as session:
+        yield session
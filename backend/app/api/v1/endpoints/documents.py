@@ -1,19 +1,62 @@
 """
 Documents API Endpoints - Optimized with Caching
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from urllib.parse import quote
+import aiofiles.os
+import asyncio
+import json
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, desc, and_, or_
+from datetime import datetime, timedelta
 from typing import List, Optional
 from uuid import UUID
 
-from app.core.database import get_db
-from app.core.cache import get_cached, set_cached, delete_pattern
+from app.core.config import settings
+from app.core.database import get_db, read_session
+from app.core.cache import (
+    document_namespace,
+    get_cached,
+    invalidate_namespace,
+    set_cached,
+    summary_namespace,
+    user_namespace,
+    versioned_key,
+)
+from app.models.content import DocumentContent
 from app.models.document import Document
 from app.models.user import User
-from app.api.v1.schemas.document import DocumentCreate, DocumentResponse, DocumentListResponse
-from app.services.document_service import DocumentService
-from app.api.v1.dependencies import get_current_user
+from app.api.v1.schemas.document import (
+    DocumentCreate,
+    DocumentResponse,
+    DocumentListItem,
+    DocumentListResponse,
+    HEAVY_FIELDS,
+    DeadlineItem,
+    DeadlineListResponse,
+    SearchHit,
+    SearchResponse,
+    BulkUploadResponse,
+    BatchStatusResponse,
+    DocumentStatus,
+    DocumentStatusListResponse,
+)
+from app.api.v1.pagination import encode_cursor, decode_cursor
+from app.services.content_store import content_text, load_text
+from app.services.search_service import SearchFilters, search_documents
+from app.services.status_events import broker
+from app.services.document_service import DocumentService, TooManyFilesError
+from app.services.supabase_service import SupabaseService, FileTooLargeError
+from app.api.v1.file_responses import (
+    RangeFileResponse,
+    RangeNotSatisfiable,
+    http_date,
+    if_range_matches,
+    is_not_modified,
+    parse_range,
+)
+from app.api.v1.dependencies import get_current_user, get_read_db, mark_recent_write
 
 router = APIRouter()
 
@@ -26,25 +69,226 @@ async def upload_document(
 ):
     """Upload and process document - Async processing"""
     service = DocumentService(db)
-    document = await service.upload_and_process(file, current_user.id)
+    try:
+        document = await service.upload_and_process(file, current_user.id)
+    except FileTooLargeError:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds the {settings.MAX_UPLOAD_SIZE // (1024 * 1024)} MB upload limit",
+        )
     
     # Invalidate cache
-    await delete_pattern(f"documents:user:{current_user.id}:*")
+    await invalidate_namespace(user_namespace(current_user.id))
+    await mark_recent_write(current_user.id)
     
     return document
 
 
-@router.get("/", response_model=DocumentListResponse)
+@router.post("/bulk", response_model=BulkUploadResponse, status_code=201)
+async def bulk_upload_documents(
+    files: List[UploadFile] = File(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Upload many files and/or ZIP archives as one batch - Async processing
+
+    Multipart forms are capped at 1000 parts; send larger sets as a ZIP.
+    """
+    service = DocumentService(db)
+    try:
+        result = await service.bulk_ingest(files, current_user.id)
+    except TooManyFilesError:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A bulk upload may contain at most {settings.BULK_MAX_FILES} files",
+        )
+
+    # Invalidate cache once for the whole batch
+    if result.documents:
+        await invalidate_namespace(user_namespace(current_user.id))
+        await mark_recent_write(current_user.id)
+
+    return BulkUploadResponse(
+        batch_id=result.batch_id,
+        items=result.documents,
+        errors=result.errors,
+    )
+
+
+@router.get("/batches/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(
+    batch_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Processing progress of a bulk upload"""
+    result = await db.execute(
+        select(Document.status, func.count())
+        .where(
+            Document.batch_id == str(batch_id),
+            Document.uploaded_by == current_user.id,
+        )
+        .group_by(Document.status)
+    )
+    counts = dict(result.all())
+    if not counts:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    return BatchStatusResponse(
+        batch_id=str(batch_id),
+        total=sum(counts.values()),
+        counts=counts,
+        done=not (counts.get("pending") or counts.get("processing")),
+    )
+
+
+MAX_STATUS_IDS = 200
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _parse_ids(ids: Optional[str]) -> list[str]:
+    """Validated document ids from ?ids=a,b,c"""
+    if not ids:
+        return []
+    values = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if len(values) > MAX_STATUS_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_STATUS_IDS} ids per request")
+    try:
+        return [str(UUID(value)) for value in values]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid document id")
+
+
+async def _status_snapshot(db: AsyncSession, user_id: str, ids: list[str]) -> list[DocumentStatus]:
+    """Current state of the given documents, or of all unfinished ones"""
+    query = select(
+        Document.id,
+        Document.status,
+        Document.pages_done,
+        Document.page_count,
+        Document.updated_at,
+    ).where(Document.uploaded_by == user_id)
+    if ids:
+        query = query.where(Document.id.in_(ids))
+    else:
+        query = query.where(Document.status.in_(("pending", "processing")))
+    result = await db.execute(query.order_by(Document.created_at))
+    return [DocumentStatus.model_validate(row) for row in result.all()]
+
+
+@router.get("/status", response_model=DocumentStatusListResponse)
+async def get_documents_status(
+    ids: Optional[str] = Query(None, description="Comma-separated document ids; default: all unfinished"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Processing status of many documents in one call - for clients that can't stream (uncached)"""
+    items = await _status_snapshot(db, current_user.id, _parse_ids(ids))
+    return DocumentStatusListResponse(items=items)
+
+
+@router.get("/events")
+async def stream_document_events(
+    request: Request,
+    ids: Optional[str] = Query(None, description="Comma-separated document ids; default: all"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Server-Sent Events: status transitions and OCR progress as they happen
+
+    Starts with a `status` event per document (the given ids, or all
+    unfinished ones), then streams `status` and `progress` events.
+    """
+    wanted = set(_parse_ids(ids))
+    user_id = current_user.id
+
+    # Subscribe (confirmed by Redis) before the snapshot so no transition falls in between
+    queue = await broker.subscribe(user_id)
+    try:
+        snapshot = await _status_snapshot(db, user_id, list(wanted))
+    except Exception:
+        broker.unsubscribe(user_id, queue)
+        raise
+    # Events already queued may predate the snapshot
+    backlog = queue.qsize()
+
+    return StreamingResponse(
+        _sse_events(request, user_id, queue, snapshot, wanted, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def _predates(event: dict, item: DocumentStatus) -> bool:
+    """Whether a queued event is older than the snapshot of its document"""
+    if item.status in TERMINAL_STATUSES:
+        return event["status"] not in TERMINAL_STATUSES
+    if event["type"] == "progress":
+        return (event.get("pages_done") or 0) <= (item.pages_done or 0)
+    return False
+
+
+async def _sse_events(
+    request: Request,
+    user_id: str,
+    queue: asyncio.Queue,
+    snapshot,
+    wanted: set,
+    backlog: int = 0,
+):
+    try:
+        yield "retry: 3000\n\n"
+        for item in snapshot:
+            yield _sse("status", {"type": "status", "document_id": item.id, **item.model_dump(exclude={"id"})})
+        snapshot_by_id = {item.id: item for item in snapshot}
+
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if backlog > 0:
+                backlog -= 1
+                item = snapshot_by_id.get(event["document_id"])
+                if item is not None and _predates(event, item):
+                    continue
+            if wanted and event["document_id"] not in wanted:
+                continue
+            yield _sse(event["type"], event)
+    finally:
+        broker.unsubscribe(user_id, queue)
+
+
+@router.get("/", response_model=DocumentListResponse, response_model_exclude_unset=True)
 async def list_documents(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     limit: int = Query(20, ge=1, le=100),
     status: Optional[str] = None,
     language: Optional[str] = None,
+    include_total: bool = False,
+    include: Optional[str] = Query(None, description="Comma-separated heavy fields: ocr_text, summary, metadata"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List documents with pagination and filters - Cached"""
-    cache_key = f"documents:user:{current_user.id}:{skip}:{limit}:{status}:{language}"
+    """List documents, newest first - keyset paginated and cached
+
+    Pass `next_cursor` back as `cursor` for the next page; every page is an
+    index range scan on (uploaded_by, created_at, id), however deep. Only the
+    light columns are selected unless heavy fields are asked for via `include`.
+    """
+    included = _parse_include(include)
+    cache_key = await versioned_key(
+        user_namespace(current_user.id),
+        f"{cursor}:{limit}:{status}:{language}:{include_total}:{','.join(included)}",
+    )
     
     # Try cache first
     cached_result = await get_cached(cache_key)
@@ -52,43 +296,254 @@ async def list_documents(
         return cached_result
     
     # Build query
-    query = select(Document).where(Document.uploaded_by == current_user.id)
-    
+    filters = [Document.uploaded_by == current_user.id]
     if status:
-        query = query.where(Document.status == status)
+        filters.append(Document.status == status)
     if language:
-        query = query.where(Document.language == language)
+        filters.append(Document.language == language)
+    query = select(*_LIST_COLUMNS, *(c for f in included for c in _HEAVY_COLUMNS[f])).where(*filters)
+    if "ocr_text" in included:
+        query = query.outerjoin(DocumentContent, DocumentContent.document_id == Document.id)
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    after = decode_cursor(cursor, datetime, str)
+    if after:
+        last_created, last_id = after
+        query = query.where(or_(
+            Document.created_at < last_created,
+            and_(Document.created_at == last_created, Document.id < last_id),
+        ))
     
-    # Get documents
-    query = query.order_by(desc(Document.created_at)).offset(skip).limit(limit)
+    # One extra row tells us whether there is a next page
+    query = query.order_by(desc(Document.created_at), desc(Document.id)).limit(limit + 1)
     result = await db.execute(query)
-    documents = result.scalars().all()
+    documents = result.all()
+    
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        last = documents[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    
+    total = None
+    if include_total:
+        count_key = await versioned_key(user_namespace(current_user.id), f"count:{status}:{language}")
+        total = await _count_documents(db, count_key, filters)
+    
+    items = [DocumentListItem.model_validate(row) for row in documents]
+    if "ocr_text" in included:
+        texts = await asyncio.to_thread(
+            lambda: [content_text(row.codec, row.text_data, row.legacy_ocr_text) for row in documents]
+        )
+        for item, text in zip(items, texts):
+            item.ocr_text = text
     
     response = DocumentListResponse(
-        items=[DocumentResponse.from_orm(doc) for doc in documents],
-        total=total,
-        skip=skip,
+        items=items,
+        next_cursor=next_cursor,
         limit=limit,
+        total=total,
     )
     
-    # Cache result
-    await set_cached(cache_key, response.dict(), ttl=300)  # 5 minutes
+    # Cache result (fields that weren't selected are left out entirely)
+    payload = response.model_dump(exclude_unset=True)
+    await set_cached(cache_key, payload, ttl=300)  # 5 minutes
     
-    return response
+    return payload
+
+
+# Columns a list row always carries; heavy ones are added only when included
+_LIST_COLUMNS = tuple(
+    getattr(Document, name)
+    for name in DocumentListItem.model_fields
+    if name not in HEAVY_FIELDS
+)
+_HEAVY_COLUMNS = {
+    # Compressed text from document_contents, or the not yet migrated inline column
+    "ocr_text": (DocumentContent.codec, DocumentContent.text_data, Document.legacy_ocr_text),
+    "summary": (Document.summary,),
+    "metadata": (Document.extra_metadata,),
+}
+
+
+def _parse_include(include: Optional[str]) -> list[str]:
+    """Validated, de-duplicated heavy fields from ?include=a,b"""
+    if not include:
+        return []
+    fields = sorted({f.strip() for f in include.split(",") if f.strip()})
+    unknown = [f for f in fields if f not in HEAVY_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include field(s): {', '.join(unknown)}")
+    return fields
+
+
+async def _count_documents(db: AsyncSession, cache_key: str, filters: list) -> int:
+    """Total matching documents - cached apart from the pages, so it is counted
+    once per filter set rather than on every page (approximate within the TTL)"""
+    cached_total = await get_cached(cache_key)
+    if cached_total is not None:
+        return cached_total
+
+    # Covered by idx_document_user_status_created: an index-only count
+    total = await db.scalar(select(func.count(Document.id)).where(*filters))
+    await set_cached(cache_key, total, ttl=300)
+    return total
+
+
+def _deadline_query(user_id: str, start: datetime, end: datetime):
+    """Upcoming deadlines for a user - a range scan on idx_document_user_deadline"""
+    return (
+        select(
+            Document.id,
+            Document.title,
+            Document.file_name,
+            Document.status,
+            Document.extracted_deadline,
+        )
+        .where(
+            Document.uploaded_by == user_id,
+            Document.extracted_deadline >= start,
+            Document.extracted_deadline < end,
+        )
+        .order_by(Document.extracted_deadline, Document.id)
+    )
+
+
+def _ics_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _ics_line(line: str) -> str:
+    """Fold a content line at 75 octets (RFC 5545 3.1)"""
+    data = line.encode()
+    chunks = []
+    while len(data) > 75:
+        cut = 75 if not chunks else 74
+        # Don't split a UTF-8 sequence
+        while cut > 0 and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        chunks.append(data[:cut].decode())
+        data = data[cut:]
+    chunks.append(data.decode())
+    return "\r\n ".join(chunks) + "\r\n"
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=500),
+    status: Optional[str] = None,
+    language: Optional[str] = None,
+    created_from: Optional[datetime] = Query(None, alias="from"),
+    created_to: Optional[datetime] = Query(None, alias="to"),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=500),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Full-text search over titles and extracted text, best matches first
+
+    Served from the full-text index (FTS5 on SQLite, GIN on Postgres), never
+    a scan of the stored text.
+    """
+    filters = SearchFilters(
+        status=status,
+        language=language,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    rows = await search_documents(db, current_user.id, q, filters, limit=limit, offset=offset)
+    return SearchResponse(
+        query=q,
+        items=[SearchHit.model_validate(row) for row in rows],
+        limit=limit,
+        offset=offset,
+    )
+
+
+@router.get("/deadlines", response_model=DeadlineListResponse)
+async def list_deadlines(
+    start: Optional[datetime] = None,
+    days: int = Query(30, ge=1, le=366),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    format: str = Query("json", regex="^(json|ics)$"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Upcoming deadlines in a time window - keyset paginated, or an iCalendar feed"""
+    start = start or datetime.utcnow()
+    end = start + timedelta(days=days)
+    query = _deadline_query(current_user.id, start, end)
+
+    if format == "ics":
+        return StreamingResponse(
+            _ics_feed(query),
+            media_type="text/calendar; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="deadlines.ics"'},
+        )
+
+    after = decode_cursor(cursor, datetime, str)
+    if after:
+        last_deadline, last_id = after
+        query = query.where(or_(
+            Document.extracted_deadline > last_deadline,
+            and_(Document.extracted_deadline == last_deadline, Document.id > last_id),
+        ))
+
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+    items = [DeadlineItem.model_validate(row, from_attributes=True) for row in rows[:limit]]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.extracted_deadline, last.id)
+
+    return DeadlineListResponse(items=items, next_cursor=next_cursor)
+
+
+async def _ics_feed(query):
+    """Stream VEVENTs as rows arrive instead of building the calendar in memory.
+
+    Uses its own session: request dependencies are torn down before a
+    streaming body is sent.
+    """
+    yield _ics_line("BEGIN:VCALENDAR")
+    yield _ics_line("VERSION:2.0")
+    yield _ics_line("PRODID:-//DocuFlow//Deadlines//EN")
+    yield _ics_line("CALSCALE:GREGORIAN")
+
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    async with read_session() as db:
+        result = await db.stream(query.execution_options(yield_per=500))
+        async for row in result:
+            day = row.extracted_deadline.date()
+            yield (
+                _ics_line("BEGIN:VEVENT")
+                + _ics_line(f"UID:{row.id}@docuflow")
+                + _ics_line(f"DTSTAMP:{stamp}")
+                + _ics_line(f"DTSTART;VALUE=DATE:{day:%Y%m%d}")
+                + _ics_line(f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}")
+                + _ics_line(f"SUMMARY:{_ics_text('Deadline: ' + row.title)}")
+                + _ics_line(f"DESCRIPTION:{_ics_text(row.file_name)}")
+                + _ics_line("END:VEVENT")
+            )
+
+    yield _ics_line("END:VCALENDAR")
 
 
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get document by ID - Cached"""
-    cache_key = f"document:{document_id}"
+    cache_key = await versioned_key(document_namespace(document_id), "detail")
     
     cached_result = await get_cached(cache_key)
     if cached_result:
@@ -106,11 +561,90 @@ async def get_document(
         raise HTTPException(status_code=404, detail="Document not found")
     
     response = DocumentResponse.from_orm(document)
+    response.ocr_text = await load_text(db, document.id)
     await set_cached(cache_key, response.dict(), ttl=600)  # 10 minutes
     
     return response
 
 
+@router.get("/{document_id}/download")
+async def download_document(
+    document_id: UUID,
+    request: Request,
+    disposition: str = Query("inline", regex="^(inline|attachment)$"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Download the original file - supports Range and conditional requests"""
+    result = await db.execute(
+        select(
+            Document.file_path,
+            Document.file_name,
+            Document.file_type,
+            Document.content_hash,
+            Document.created_at,
+        ).where(
+            Document.id == str(document_id),
+            Document.uploaded_by == current_user.id
+        )
+    )
+    document = result.one_or_none()
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    # Content-addressed objects never change: the hash is a strong validator
+    etag = f'"{document.content_hash}"' if document.content_hash else None
+    last_modified = document.created_at
+    headers = {
+        "content-disposition": f"{disposition}; filename*=UTF-8''{quote(document.file_name)}",
+        "cache-control": "private, max-age=86400",
+    }
+    if etag:
+        headers["etag"] = etag
+    if last_modified:
+        headers["last-modified"] = http_date(last_modified)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    storage = SupabaseService()
+    local = storage.local_path(document.file_path)
+    if local is not None:
+        if settings.DOWNLOAD_ACCEL_REDIRECT_PREFIX and local.is_relative_to(storage.local_root):
+            relative = local.relative_to(storage.local_root).as_posix()
+            return RangeFileResponse(
+                local,
+                size=0,
+                headers=headers,
+                media_type=document.file_type,
+                accel_redirect=settings.DOWNLOAD_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + relative,
+            )
+
+        size = (await aiofiles.os.stat(local)).st_size
+        try:
+            byte_range = parse_range(request, size, etag, last_modified)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={**headers, "content-range": f"bytes */{size}"})
+        return RangeFileResponse(local, size, byte_range, headers=headers, media_type=document.file_type)
+
+    if not storage.remote_enabled:
+        raise HTTPException(status_code=404, detail="File not found in storage")
+
+    # Remote storage: proxy in streamed chunks, letting Supabase apply the range
+    range_header = request.headers.get("range")
+    if range_header and not if_range_matches(request, etag, last_modified):
+        range_header = None
+    status_code, upstream_headers, body = await storage.stream_download(document.file_path, range_header)
+    if status_code >= 400 and status_code != 416:
+        raise HTTPException(status_code=502 if status_code >= 500 else 404, detail="File not available")
+    return StreamingResponse(
+        body,
+        status_code=status_code,
+        headers={**headers, **upstream_headers, "accept-ranges": "bytes"},
+        media_type=document.file_type,
+    )
+
+
 @router.delete("/{document_id}", status_code=204)
 async def delete_document(
     document_id: UUID,
@@ -133,7 +667,11 @@ async def delete_document(
     await service.delete_document(document)
     
     # Invalidate cache
-    await delete_pattern(f"document:{document_id}*")
-    await delete_pattern(f"documents:user:{current_user.id}:*")
+    await invalidate_namespace(
+        user_namespace(current_user.id),
+        document_namespace(document_id),
+        summary_namespace(document_id),
+    )
+    await mark_recent_write(current_user.id)
     
     return None
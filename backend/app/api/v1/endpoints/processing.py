@@ -1,14 +1,17 @@
 """
 Document Processing Endpoints
 """
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from uuid import UUID
 
 from app.core.database import get_db
-from app.api.v1.dependencies import get_current_user
+from app.api.v1.dependencies import get_current_user, mark_recent_write
+from app.models.document import Document
 from app.models.user import User
 from app.services.processing_service import ProcessingService
+from app.services.processing_worker import notify_worker
 
 router = APIRouter()
 
@@ -16,12 +19,22 @@ router = APIRouter()
 @router.post("/process/{document_id}")
 async def process_document(
     document_id: UUID,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Trigger document processing (OCR, embedding, etc.)"""
+    """Queue document processing (OCR, embedding, etc.)"""
+    result = await db.execute(
+        select(Document.id).where(
+            Document.id == str(document_id),
+            Document.uploaded_by == current_user.id
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
     service = ProcessingService(db)
-    await service.process_document_async(document_id, current_user.id, background_tasks)
+    job = await service.process_document_async(document_id, current_user.id)
+    notify_worker()
+    await mark_recent_write(current_user.id)
     
-    return {"status": "processing_started", "document_id": str(document_id)}
+    return {"status": "processing_queued", "document_id": str(document_id), "job_id": job.id}
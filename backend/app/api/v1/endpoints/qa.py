@@ -6,12 +6,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
 from typing import Optional
+import hashlib
 
-from app.core.database import get_db
-from app.core.cache import get_cached, set_cached
+from app.core.cache import (
+    document_namespace,
+    get_cached,
+    set_cached,
+    summary_namespace,
+    user_namespace,
+    versioned_key,
+)
 from app.models.document import Document
 from app.models.user import User
-from app.api.v1.dependencies import get_current_user
+from app.api.v1.dependencies import get_current_user, get_read_db
 from app.services.rag_service import RAGService
 from app.api.v1.schemas.qa import QuestionRequest, QuestionResponse
 
@@ -22,7 +29,7 @@ router = APIRouter()
 async def ask_question(
     question_data: QuestionRequest,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Ask question using RAG pipeline - Cached"""
     # Validate document access
@@ -38,8 +45,14 @@ async def ask_question(
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
     
-    # Check cache
-    cache_key = f"qa:{question_data.document_id}:{hash(question_data.question)}"
+    # Check cache (answers over all documents are scoped to the user's namespace)
+    namespace = (
+        document_namespace(question_data.document_id)
+        if question_data.document_id
+        else user_namespace(current_user.id)
+    )
+    question_hash = hashlib.sha256(question_data.question.encode("utf-8")).hexdigest()[:32]
+    cache_key = await versioned_key(namespace, f"qa:{question_data.language or 'en'}:{question_hash}")
     cached_result = await get_cached(cache_key)
     if cached_result:
         return cached_result
@@ -63,10 +76,10 @@ async def get_summary(
     document_id: UUID,
     language: str = Query("en", regex="^(en|hi|ml|ta|te)$"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get multilingual summary - Cached"""
-    cache_key = f"summary:{document_id}:{language}"
+    cache_key = await versioned_key(summary_namespace(document_id), language)
     
     cached_result = await get_cached(cache_key)
     if cached_result:
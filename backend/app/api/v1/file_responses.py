@@ -0,0 +1,174 @@
+"""
+File Responses - HTTP Range and Conditional Requests
+
+Stored objects are content-addressed and never change, so the SHA-256 is a
+strong ETag and validators are cheap. Local files are sent without passing
+through Python when possible:
+
+1. DOWNLOAD_ACCEL_REDIRECT_PREFIX set: hand the file to the reverse proxy
+   (nginx X-Accel-Redirect), which serves ranges with sendfile.
+2. The server supports the ASGI `http.response.zerocopysend` extension: the
+   file descriptor is passed to the server for sendfile.
+3. Otherwise the requested range is streamed in chunks with aiofiles.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+
+import aiofiles
+from fastapi import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+CHUNK_SIZE = 256 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """The Range header can't be served for this file"""
+
+
+def http_date(value: datetime) -> str:
+    """IMF-fixdate for a naive UTC datetime"""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).replace(tzinfo=None)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_not_modified(request: Request, etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since (RFC 9110 13.2.2)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if not etag:
+            return False
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    since = _parse_http_date(request.headers.get("if-modified-since"))
+    if since and last_modified:
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def if_range_matches(request: Request, etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """Whether a Range request still applies under If-Range (always, if absent)"""
+    value = request.headers.get("if-range")
+    if value is None:
+        return True
+    if value.startswith('"') or value.startswith("W/"):
+        return bool(etag) and value == etag
+    since = _parse_http_date(value)
+    return bool(since and last_modified and last_modified.replace(microsecond=0) == since)
+
+
+def parse_range(
+    request: Request,
+    size: int,
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+) -> Optional[tuple[int, int]]:
+    """Requested byte range as inclusive (start, end), or None for the whole file.
+
+    Only single ranges are honoured; multi-range requests get the full body,
+    which RFC 9110 allows.
+    """
+    header = request.headers.get("range")
+    if not header or not if_range_matches(request, etag, last_modified):
+        return None
+
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length == 0:
+                raise RangeNotSatisfiable()
+            start, end = max(size - length, 0), size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+class RangeFileResponse(Response):
+    """Serve a byte range of a local file (see module docstring for strategies)"""
+
+    def __init__(
+        self,
+        path: Path,
+        size: int,
+        byte_range: Optional[tuple[int, int]] = None,
+        headers: Optional[dict] = None,
+        media_type: Optional[str] = None,
+        accel_redirect: Optional[str] = None,
+    ):
+        self.path = path
+        self.start, self.end = byte_range or (0, size - 1)
+        self.accel_redirect = accel_redirect
+        status_code = 206 if byte_range else 200
+
+        headers = dict(headers or {})
+        headers["accept-ranges"] = "bytes"
+        if accel_redirect:
+            # The proxy handles Range itself; just forward the request
+            headers["x-accel-redirect"] = accel_redirect
+            super().__init__(status_code=200, headers=headers, media_type=media_type)
+            del self.headers["content-length"]
+            return
+
+        headers["content-length"] = str(max(self.end - self.start + 1, 0))
+        if byte_range:
+            headers["content-range"] = f"bytes {self.start}-{self.end}/{size}"
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+
+        length = self.end - self.start + 1
+        if self.accel_redirect or scope["method"] == "HEAD" or length <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.start,
+                    "count": length,
+                    "more_body": False,
+                })
+            return
+
+        async with aiofiles.open(self.path, "rb") as file:
+            await file.seek(self.start)
+            remaining = length
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # File shrank underneath us; end the body rather than hang
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -0,0 +1,37 @@
+"""
+Keyset Pagination Helpers
+
+Cursors are opaque to clients: URL-safe base64 of the sort key of the last
+row returned. Pages are fetched with `WHERE (key, id) > cursor`, which stays
+an index range scan no matter how deep the client pages.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row into an opaque token"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str], *types: type) -> Optional[tuple]:
+    """Decode a cursor into values of the given types (400 if malformed)"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if len(payload) != len(types):
+            raise ValueError("cursor arity")
+        return tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for value, kind in zip(payload, types)
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
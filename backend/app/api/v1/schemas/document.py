@@ -1,7 +1,7 @@
 """
 Document Schemas
 """
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, List, Dict, Any
@@ -20,11 +20,19 @@ class DocumentResponse(BaseModel):
     file_path: str
     file_type: str
     file_size: int
+    content_hash: Optional[str] = None
+    batch_id: Optional[str] = None
     language: Optional[str] = None
     summary: Optional[str] = None
     extracted_deadline: Optional[datetime] = None
-    metadata: Optional[Dict[str, Any]] = None
+    # The ORM attribute is `extra_metadata` (`metadata` is taken by SQLAlchemy);
+    # cached payloads carry the serialized name
+    metadata: Optional[Dict[str, Any]] = Field(
+        None, validation_alias=AliasChoices("extra_metadata", "metadata")
+    )
     status: str
+    pages_done: Optional[int] = None
+    page_count: Optional[int] = None
     ocr_text: Optional[str] = None
     vector_id: Optional[str] = None
     uploaded_by: str
@@ -35,8 +43,122 @@ class DocumentResponse(BaseModel):
         from_attributes = True
 
 
+# Large columns left out of list responses unless requested with ?include=
+HEAVY_FIELDS = ("ocr_text", "summary", "metadata")
+
+
+class DocumentListItem(BaseModel):
+    """A document in a list: heavy fields are only present when included"""
+    id: str
+    title: str
+    file_name: str
+    file_path: str
+    file_type: str
+    file_size: int
+    content_hash: Optional[str] = None
+    batch_id: Optional[str] = None
+    language: Optional[str] = None
+    extracted_deadline: Optional[datetime] = None
+    status: str
+    pages_done: Optional[int] = None
+    page_count: Optional[int] = None
+    vector_id: Optional[str] = None
+    uploaded_by: str
+    created_at: datetime
+    updated_at: datetime
+    summary: Optional[str] = None
+    ocr_text: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = Field(
+        None, validation_alias=AliasChoices("extra_metadata", "metadata")
+    )
+    
+    class Config:
+        from_attributes = True
+
+
 class DocumentListResponse(BaseModel):
-    items: List[DocumentResponse]
-    total: int
-    skip: int
+    items: List[DocumentListItem]
+    next_cursor: Optional[str] = None
     limit: int
+    total: Optional[int] = None  # only with include_total=true
+
+
+class DeadlineItem(BaseModel):
+    id: str
+    title: str
+    file_name: str
+    status: str
+    extracted_deadline: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class DeadlineListResponse(BaseModel):
+    items: List[DeadlineItem]
+    next_cursor: Optional[str] = None
+
+
+class SearchHit(BaseModel):
+    """A search match; `snippet` is HTML-escaped document text with matches in <mark> tags"""
+    id: str
+    title: str
+    file_name: str
+    status: str
+    language: Optional[str] = None
+    created_at: datetime
+    extracted_deadline: Optional[datetime] = None
+    score: float
+    snippet: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class SearchResponse(BaseModel):
+    query: str
+    items: List[SearchHit]
+    limit: int
+    offset: int
+
+
+class BulkUploadItem(BaseModel):
+    id: str
+    file_name: str
+    status: str
+    
+    class Config:
+        from_attributes = True
+
+
+class BulkUploadError(BaseModel):
+    file_name: Optional[str] = None
+    error: str
+
+
+class BulkUploadResponse(BaseModel):
+    batch_id: str
+    items: List[BulkUploadItem]
+    errors: List[BulkUploadError] = []
+
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    total: int
+    counts: Dict[str, int]  # documents per status
+    done: bool  # nothing left pending or processing
+
+
+class DocumentStatus(BaseModel):
+    id: str
+    status: str
+    pages_done: Optional[int] = None
+    page_count: Optional[int] = None
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class DocumentStatusListResponse(BaseModel):
+    items: List[DocumentStatus]
@@ -1,20 +1,88 @@
 """
 Redis Cache Configuration - High-Performance Caching
+
+Two tiers: a size-bounded in-process LRU holds decoded values for a short
+TTL in front of Redis, so hot keys cost neither a round-trip nor a
+`json.loads`. Deletes are broadcast on the `cache:invalidate` channel and
+every uvicorn worker evicts its local copy. When Redis is unavailable the
+local tier keeps working on its own; other workers' copies then expire
+within CACHE_LOCAL_TTL.
+
+Groups of keys (a user's document lists, everything about one document)
+live under a versioned namespace: keys embed the namespace's generation
+counter, so `invalidate_namespace` is a single INCR and the orphaned
+entries simply expire.
+
+Values handed out by the local tier are shared between requests: treat
+them as read-only.
 """
 import redis.asyncio as redis
+import asyncio
+import fnmatch
 import json
+import logging
+import time
+from collections import OrderedDict
 from typing import Optional, Any
 from functools import wraps
 import hashlib
 
 from app.core.config import settings
+from app.core.monitoring import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache:invalidate"
 
 redis_client: Optional[redis.Redis] = None
 
 
+class LocalCache:
+    """In-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def delete_pattern(self, pattern: str) -> int:
+        keys = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+
+
+local_cache = LocalCache(settings.CACHE_LOCAL_MAX_ENTRIES)
+_listener: Optional[asyncio.Task] = None
+
+
 async def init_cache():
     """Initialize Redis connection"""
-    global redis_client
+    global redis_client, _listener
     if settings.ENABLE_CACHE:
         try:
             redis_client = await redis.from_url(
@@ -23,10 +91,60 @@ async def init_cache():
                 decode_responses=True,
                 max_connections=50,
             )
-            # Validate connectivity; if Redis isn't running, disable cache gracefully.
+            # Validate connectivity; if Redis isn't running, fall back to the local tier.
             await redis_client.ping()
         except Exception:
             redis_client = None
+            logger.warning("Redis unavailable; caching in-process only")
+        if redis_client is not None:
+            _listener = asyncio.create_task(_listen_invalidations(), name="cache-invalidation")
+
+
+async def close_cache():
+    global _listener
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except asyncio.CancelledError:
+            pass
+        _listener = None
+
+
+async def _listen_invalidations():
+    """Apply other workers' deletes to the local tier"""
+    while True:
+        client = redis_client
+        if client is None:
+            return
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Deletes may have been missed while unsubscribed
+            local_cache.clear()
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                event = json.loads(message["data"])
+                if "pattern" in event:
+                    local_cache.delete_pattern(event["pattern"])
+                else:
+                    for key in event.get("keys") or [event["key"]]:
+                        local_cache.delete(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Cache invalidation subscription failed; reconnecting")
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.reset()
+
+
+async def _broadcast(event: dict):
+    try:
+        await redis_client.publish(INVALIDATION_CHANNEL, json.dumps(event))
+    except Exception:
+        logger.warning("Cache invalidation broadcast failed")
 
 
 async def get_cache() -> Optional[redis.Redis]:
@@ -35,57 +153,85 @@ async def get_cache() -> Optional[redis.Redis]:
 
 
 async def get_cached(key: str) -> Optional[Any]:
-    """Get value from cache"""
-    if not redis_client or not settings.ENABLE_CACHE:
+    """Get value from cache (local tier first, then Redis)"""
+    if not settings.ENABLE_CACHE:
         return None
-    
-    try:
-        value = await redis_client.get(key)
-        if value:
-            return json.loads(value)
-    except Exception:
-        pass
+
+    value = local_cache.get(key)
+    if value is not None:
+        CACHE_REQUESTS.labels(tier="local").inc()
+        return value
+
+    if redis_client:
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                payload, ttl = await pipe.get(key).ttl(key).execute()
+            if payload:
+                value = json.loads(payload)
+                # Never keep a local copy longer than Redis keeps the key
+                local_cache.set(key, value, _local_ttl(ttl if ttl > 0 else None))
+                CACHE_REQUESTS.labels(tier="redis").inc()
+                return value
+        except Exception:
+            pass
+    CACHE_REQUESTS.labels(tier="miss").inc()
     return None
 
 
+def _local_ttl(ttl: Optional[int]) -> int:
+    return min(ttl or settings.CACHE_TTL, settings.CACHE_LOCAL_TTL)
+
+
 async def set_cached(key: str, value: Any, ttl: int = None) -> bool:
     """Set value in cache"""
-    if not redis_client or not settings.ENABLE_CACHE:
+    if not settings.ENABLE_CACHE:
         return False
-    
+
+    ttl = ttl or settings.CACHE_TTL
+    payload = json.dumps(value, default=str)
+    # Keep what Redis would hand back (e.g. datetimes as strings), not the caller's object
+    local_cache.set(key, json.loads(payload), _local_ttl(ttl))
+    if not redis_client:
+        return True
+
     try:
-        ttl = ttl or settings.CACHE_TTL
-        await redis_client.setex(
-            key,
-            ttl,
-            json.dumps(value, default=str)
-        )
+        await redis_client.setex(key, ttl, payload)
         return True
     except Exception:
         return False
 
 
 async def delete_cached(key: str) -> bool:
-    """Delete key from cache"""
-    if not redis_client or not settings.ENABLE_CACHE:
+    """Delete key from cache, in every worker"""
+    if not settings.ENABLE_CACHE:
         return False
-    
+
+    local_cache.delete(key)
+    if not redis_client:
+        return True
+
     try:
         await redis_client.delete(key)
+        await _broadcast({"key": key})
         return True
     except Exception:
         return False
 
 
 async def delete_pattern(pattern: str) -> int:
-    """Delete all keys matching pattern"""
-    if not redis_client or not settings.ENABLE_CACHE:
+    """Delete all keys matching pattern, in every worker"""
+    if not settings.ENABLE_CACHE:
         return 0
-    
+
+    deleted = local_cache.delete_pattern(pattern)
+    if not redis_client:
+        return deleted
+
     try:
         keys = []
         async for key in redis_client.scan_iter(match=pattern):
             keys.append(key)
+        await _broadcast({"pattern": pattern})
         if keys:
             return await redis_client.delete(*keys)
         return 0
@@ -93,6 +239,80 @@ async def delete_pattern(pattern: str) -> int:
         return 0
 
 
+def user_namespace(user_id) -> str:
+    """A user's document lists and counts"""
+    return f"documents:user:{user_id}"
+
+
+def document_namespace(document_id) -> str:
+    """A document's details and the answers about it"""
+    return f"document:{document_id}"
+
+
+def summary_namespace(document_id) -> str:
+    return f"summary:{document_id}"
+
+
+def _generation_seed() -> int:
+    # Microseconds since the epoch: an expired or evicted counter restarts above
+    # every version it handed out, so counters can expire (CACHE_NAMESPACE_TTL)
+    return time.time_ns() // 1000
+
+
+async def namespace_generation(namespace: str) -> int:
+    """Current generation of a namespace (served from the local tier when fresh)"""
+    key = f"gen:{namespace}"
+    generation = local_cache.get(key)
+    if generation is not None:
+        return generation
+
+    if redis_client:
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, _generation_seed(), nx=True, ex=settings.CACHE_NAMESPACE_TTL)
+                _, generation = await pipe.get(key).execute()
+            generation = int(generation)
+            local_cache.set(key, generation, settings.CACHE_LOCAL_TTL)
+            return generation
+        except Exception:
+            pass
+
+    # Local-only: the counter lives as long as the local tier keeps it
+    generation = _generation_seed()
+    local_cache.set(key, generation, settings.CACHE_NAMESPACE_TTL)
+    return generation
+
+
+async def versioned_key(namespace: str, suffix: str) -> str:
+    """Cache key under the namespace's current generation"""
+    return f"{namespace}:v{await namespace_generation(namespace)}:{suffix}"
+
+
+async def invalidate_namespace(*namespaces: str):
+    """Orphan every key in the namespaces: one INCR each, no key scan"""
+    if not settings.ENABLE_CACHE or not namespaces:
+        return
+
+    keys = [f"gen:{namespace}" for namespace in namespaces]
+    if redis_client:
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(key, _generation_seed(), nx=True, ex=settings.CACHE_NAMESPACE_TTL)
+                    pipe.incr(key).expire(key, settings.CACHE_NAMESPACE_TTL)
+                results = await pipe.execute()
+            for key, generation in zip(keys, results[1::3]):
+                local_cache.set(key, generation, settings.CACHE_LOCAL_TTL)
+            await _broadcast({"keys": keys})
+            return
+        except Exception:
+            pass
+
+    for namespace, key in zip(namespaces, keys):
+        generation = await namespace_generation(namespace)
+        local_cache.set(key, generation + 1, settings.CACHE_NAMESPACE_TTL)
+
+
 def cache_key(*args, **kwargs) -> str:
     """Generate cache key from arguments"""
     key_str = f"{args}:{sorted(kwargs.items())}"
@@ -23,10 +23,44 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_PRE_PING: bool = True
     
+    # Read replicas (comma-separated URLs); empty = all reads on the primary
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_HEALTH_INTERVAL: float = 10.0  # seconds between replica health checks
+    REPLICA_HEALTH_TIMEOUT: float = 2.0
+    REPLICA_MAX_LAG_SECONDS: float = 30.0  # replicas further behind are taken out of rotation
+    READ_YOUR_WRITES_SECONDS: int = 10  # after a user writes, serve their reads from the primary
+    
+    # SQLite profile (file databases): WAL, one serialized writer, pooled readers
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # NORMAL is durable at checkpoints under WAL; FULL fsyncs every commit
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # wait this long for another process's write lock
+    SQLITE_CACHE_SIZE_KB: int = 65536  # page cache per connection
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # memory-mapped reads; 0 disables
+    SQLITE_READ_POOL_SIZE: int = 8  # pooled read connections (the writer is always one)
+    SQLITE_POOL_TIMEOUT: float = 30.0  # seconds a session waits for a connection (mostly the writer)
+    
     # Redis Cache
     REDIS_URL: str = "redis://localhost:6379/0"
     CACHE_TTL: int = 3600  # 1 hour default
+    CACHE_LOCAL_MAX_ENTRIES: int = 2048  # in-process tier in front of Redis (per worker)
+    CACHE_LOCAL_TTL: int = 30  # seconds; bounds staleness if an invalidation is missed
+    CACHE_NAMESPACE_TTL: int = 7200  # generation counters; at least the longest cached entry's TTL
     
+    # File Storage
+    STORAGE_BACKEND: str = "auto"  # auto | local | supabase | s3
+    STORAGE_MAX_CONNECTIONS: int = 32  # pooled HTTP connections to the storage service
+
+    # S3-compatible storage (AWS S3, MinIO, R2)
+    S3_BUCKET: str = "documents"
+    S3_ENDPOINT_URL: str = ""  # e.g. http://localhost:9000 for MinIO
+    S3_REGION: str = ""
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
+    S3_FORCE_PATH_STYLE: bool = False  # required by MinIO
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024
+    S3_MAX_CONCURRENCY: int = 8  # parallel parts / ranged reads per transfer
+
     # Supabase Storage
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
@@ -45,6 +79,22 @@ class Settings(BaseSettings):
     # OCR Settings
     OCR_ENGINE: str = "tesseract"  # or "google-vision"
     TESSERACT_CMD: str = "/usr/bin/tesseract"
+    TESSDATA_PREFIX: str = ""  # traineddata dir for tesserocr; empty = library default
+    OCR_ENGINE_MAX_PAGES: int = 500  # recycle a warm tesseract engine after N pages
+    OCR_ENGINE_MAX_PER_WORKER: int = 4  # warm engines (language sets) per OCR process
+    OCR_POOL_SIZE: int = 0  # OCR worker processes; 0 = one per CPU core
+    OCR_PAGE_WINDOW: int = 0  # max pages of one PDF in flight; 0 = OCR_POOL_SIZE
+    OCR_PROGRESS_EVERY_PAGES: int = 5  # persist partial ocr_text every N pages
+    OCR_DETECT_SCRIPT: bool = True  # narrow tesseract languages per page via OSD
+    OCR_SCRIPT_MIN_CONFIDENCE: float = 2.0  # below this OSD script_conf, use all languages
+    PDF_TEXT_LAYER_ENABLED: bool = True  # use embedded PDF text instead of OCR when present
+    PDF_TEXT_LAYER_MIN_CHARS: int = 25  # alphanumeric chars for a page to skip OCR
+    PDFTOTEXT_CMD: str = "pdftotext"
+    
+    # Extracted text storage (document_contents)
+    CONTENT_CODEC: str = "zstd"  # zstd (zlib if zstandard isn't installed) | zlib | none
+    CONTENT_ZSTD_LEVEL: int = 9
+    SEARCH_PG_CONFIG: str = "simple"  # Postgres text search configuration (language-neutral by default)
     
     # Security
     SECRET_KEY: str = ""
@@ -55,8 +105,26 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
     
+    # Processing Worker (DB-backed job queue)
+    WORKER_ENABLED: bool = True
+    WORKER_CONCURRENCY: int = 2  # jobs per uvicorn worker process
+    WORKER_POLL_INTERVAL: float = 2.0  # seconds between polls when idle
+    WORKER_DB_POOL_SIZE: int = 0  # worker-only connections (Postgres); 0 = WORKER_CONCURRENCY + 2
+    WORKER_PROGRESS_FLUSH_SECONDS: float = 1.0  # per-page OCR progress is written in batches this often
+    JOB_LEASE_SECONDS: int = 300
+    JOB_HEARTBEAT_SECONDS: int = 30
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: int = 30
+    JOB_RETRY_BACKOFF_MAX_SECONDS: int = 1800
+
     # Performance
-    MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
+    MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB (per file, also per ZIP entry)
+    UPLOAD_FORM_OVERHEAD: int = 64 * 1024  # multipart boundaries and headers allowed on top of a single upload
+    BULK_MAX_FILES: int = 2000  # files (or ZIP entries) accepted by one bulk upload
+    BULK_UPLOAD_CONCURRENCY: int = 8  # files stored in parallel during a bulk upload
+    # Internal nginx location mapped to backend/storage (e.g. "/_storage/"); when set,
+    # local downloads are handed off with X-Accel-Redirect and served by sendfile
+    DOWNLOAD_ACCEL_REDIRECT_PREFIX: str = ""
     ENABLE_CACHE: bool = True
     ENABLE_MONITORING: bool = True
 
@@ -2,20 +2,94 @@
 Database Configuration - Async SQLAlchemy
 
 Defaults to SQLite for easy local dev; supports Postgres in production.
+
+File-backed SQLite runs in WAL mode with two pools: a single writer
+connection and a pool of readers. WAL lets readers work while a write is in
+progress, and funnelling every write through one connection (opened with
+BEGIN IMMEDIATE) queues writers in the pool instead of failing with
+"database is locked". Sessions pick the connection per statement: reads go
+to the readers until the transaction first writes, then everything up to
+commit/rollback stays on the writer so it sees its own changes.
+
+Read replicas (DATABASE_REPLICA_URLS) serve read-only endpoints through
+`get_replica_db`. They are health-checked in the background and taken out
+of rotation when unreachable or lagging; with none healthy, reads fall back
+to the primary.
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy import event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.sql.dml import UpdateBase
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.core.monitoring import DB_REPLICA_HEALTHY
+
+logger = logging.getLogger(__name__)
+
+
+def _is_file_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and ":memory:" not in url and "mode=memory" not in url
+
+
+def _sqlite_pragmas(dbapi_connection):
+    cursor = dbapi_connection.cursor()
+    for pragma in (
+        f"journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        f"mmap_size={settings.SQLITE_MMAP_SIZE}",
+        "temp_store=MEMORY",
+        "foreign_keys=ON",
+    ):
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+def _create_sqlite_engine(url: str, writer: bool):
+    # aiosqlite file databases default to NullPool, which takes no pool sizing
+    engine = create_async_engine(
+        url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1 if writer else settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_POOL_TIMEOUT,
+        echo=False,
+        future=True,
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        _sqlite_pragmas(dbapi_connection)
+        if writer:
+            # Let SQLAlchemy emit BEGIN itself (see on_begin)
+            dbapi_connection.isolation_level = None
+
+    if writer:
+        @event.listens_for(engine.sync_engine, "begin")
+        def on_begin(connection):
+            # Take the write lock up front: a deferred transaction that reads
+            # first and upgrades later can fail immediately with SQLITE_BUSY
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
 
 
 def _create_engine():
     url = settings.DATABASE_URL or ""
     is_sqlite = url.startswith("sqlite")
 
-    # SQLite doesn't support the same pooling args; use NullPool for simplicity.
+    if _is_file_sqlite(url):
+        return _create_sqlite_engine(url, writer=True)
+
+    # In-memory SQLite: a fresh database per connection, nothing to pool
     if is_sqlite:
         return create_async_engine(
             url,
@@ -36,20 +110,172 @@ def _create_engine():
     )
 
 
+# The primary engine: the only one that writes
 engine = _create_engine()
+read_engine = (
+    _create_sqlite_engine(settings.DATABASE_URL, writer=False)
+    if _is_file_sqlite(settings.DATABASE_URL or "")
+    else engine
+)
+
+
+class RoutingSession(Session):
+    """Reads on read_engine until the transaction writes, then the writer"""
+
+    _writing = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if read_engine is engine:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self._writing or self._flushing or isinstance(clause, UpdateBase):
+            self._writing = True
+            return engine.sync_engine
+        return read_engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _end_write(session, transaction):
+    if transaction.parent is None:
+        session._writing = False
+
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+# Seconds a Postgres standby is behind (0 when it has replayed everything it received)
+_PG_REPLICA_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaSet:
+    """Read replicas with background health checks, picked round-robin"""
+
+    def __init__(self, urls: list[str]):
+        self.engines = [
+            create_async_engine(
+                url,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_pre_ping=settings.DB_POOL_PRE_PING,
+                pool_recycle=3600,
+                echo=False,
+                future=True,
+            )
+            for url in urls
+        ]
+        self.healthy = [True] * len(self.engines)
+        self._next = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def pick(self) -> Optional[AsyncEngine]:
+        """Next healthy replica, or None to use the primary"""
+        for _ in range(len(self.engines)):
+            index = self._next % len(self.engines)
+            self._next += 1
+            if self.healthy[index]:
+                return self.engines[index]
+        return None
+
+    async def _check(self, engine_: AsyncEngine) -> bool:
+        async with engine_.connect() as conn:
+            if engine_.dialect.name != "postgresql":
+                await conn.execute(text("SELECT 1"))
+                return True
+            lag = await conn.scalar(_PG_REPLICA_LAG)
+            return lag is None or float(lag) <= settings.REPLICA_MAX_LAG_SECONDS
+
+    async def check(self):
+        for index, engine_ in enumerate(self.engines):
+            try:
+                ok = await asyncio.wait_for(self._check(engine_), settings.REPLICA_HEALTH_TIMEOUT)
+            except Exception:
+                ok = False
+            if ok != self.healthy[index]:
+                logger.warning("Read replica %s is %s", index, "healthy" if ok else "unhealthy")
+            self.healthy[index] = ok
+            DB_REPLICA_HEALTHY.labels(replica=str(index)).set(1 if ok else 0)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.REPLICA_HEALTH_INTERVAL)
+            await self.check()
+
+    async def start(self):
+        if self.enabled and self._task is None:
+            await self.check()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for engine_ in self.engines:
+            await engine_.dispose()
+
+
+replicas = ReplicaSet(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+)
+
+ReplicaSessionLocal = async_sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
+# Background processing gets its own pool so OCR jobs and HTTP requests
+# never wait on each other's connections. File SQLite already funnels
+# writes through one connection, so workers share the main sessions there.
+if engine.dialect.name == "sqlite":
+    worker_engine = engine
+    WorkerSessionLocal = AsyncSessionLocal
+else:
+    worker_engine = create_async_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.WORKER_DB_POOL_SIZE or settings.WORKER_CONCURRENCY + 2,
+        max_overflow=0,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=3600,
+        echo=False,
+        future=True,
+    )
+    WorkerSessionLocal = async_sessionmaker(
+        worker_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
 Base = declarative_base()
 
 
+def read_session() -> AsyncSession:
+    """Session for read-only work: a healthy replica, else the primary"""
+    replica = replicas.pick()
+    if replica is None:
+        return AsyncSessionLocal()
+    return ReplicaSessionLocal(bind=replica)
+
+
 async def get_db() -> AsyncSession:
     """Dependency for getting database session"""
     async with AsyncSessionLocal() as session:
@@ -63,6 +289,23 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+# Explicit name for endpoints that write
+get_write_db = get_db
+
+
+async def get_replica_db(primary: AsyncSession = Depends(get_db)) -> AsyncSession:
+    """Dependency for read-only sessions on a replica.
+
+    Without replicas this is the request's primary session, so endpoints
+    mixing both dependencies still share one connection.
+    """
+    if not replicas.enabled:
+        yield primary
+        return
+    async with read_session() as session:
+        yield session
+
+
 @asynccontextmanager
 async def get_db_context():
     """Context manager for database sessions"""
@@ -75,10 +318,43 @@ async def get_db_context():
             raise
 
 
+# Columns added to tables after they were first created. create_all leaves
+# existing tables alone, so init_db adds these in place (all nullable).
+_ADDED_COLUMNS = {
+    "documents": ("content_hash", "batch_id", "pages_done", "page_count"),
+}
+
+
+def _upgrade_schema(conn):
+    """Add missing columns and indexes to existing tables (idempotent)"""
+    inspector = inspect(conn)
+    preparer = conn.dialect.identifier_preparer
+    tables = set(inspector.get_table_names())
+    for table_name, column_names in _ADDED_COLUMNS.items():
+        if table_name not in tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table_name)}
+        for column in (Base.metadata.tables[table_name].c[name] for name in column_names):
+            if column.name in present:
+                continue
+            logger.info("Adding column %s.%s", table_name, column.name)
+            conn.execute(text(
+                f"ALTER TABLE {preparer.quote(table_name)} "
+                f"ADD COLUMN {preparer.quote(column.name)} {column.type.compile(conn.dialect)}"
+            ))
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 async def init_db():
-    """Initialize database - create tables"""
+    """Initialize database - create tables, then bring existing ones up to date"""
     async with engine.begin() as conn:
         # Import all models here to ensure they're registered
-        from app.models import document, user, role  # noqa
+        from app.models import document, user, role, job, content, search  # noqa
+        from app.services.search_service import create_search_index
         
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_schema)
+        await create_search_index(conn)
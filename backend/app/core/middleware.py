@@ -0,0 +1,136 @@
+"""
+ASGI Middleware
+
+Pure ASGI rather than BaseHTTPMiddleware: these wrap `send` without
+re-streaming the body, so file responses (including the zero-copy
+`http.response.zerocopysend` extension) pass through untouched.
+"""
+import json
+import time
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ProcessTimeMiddleware:
+    """Adds an X-Process-Time header (seconds until the response started)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.time()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                process_time = time.time() - start_time
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-process-time", str(process_time).encode())
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip, except for raw file downloads and event streams.
+
+    Stored files are mostly already-compressed PDFs and images, and gzipping
+    a 206 Partial Content body would invalidate its Content-Range. Event
+    streams must reach the client as each event is written, not buffered.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, skip_suffixes: tuple = ("/download", "/events")):
+        super().__init__(app, minimum_size=minimum_size)
+        self.skip_suffixes = skip_suffixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"].endswith(self.skip_suffixes):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    """Answers 413 to request bodies over `max_body_size` while they arrive.
+
+    A declared Content-Length over the limit is refused before any of the
+    body is read; a chunked or understated body is cut off as soon as the
+    bytes received pass the limit, so oversized uploads are never spooled.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_size: int,
+        path_suffixes: tuple = ("/upload",),
+        detail: str = "Request body too large",
+    ):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_suffixes = path_suffixes
+        self.detail = detail
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].endswith(self.path_suffixes):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            await self._reject(send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message: Message):
+            nonlocal response_started
+            if exceeded:
+                # Whatever the app made of the aborted body (FastAPI answers 400) is replaced
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    await self._reject(send)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            if not response_started:
+                await self._reject(send)
+
+    async def _reject(self, send: Send):
+        body = json.dumps({"detail": self.detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -2,10 +2,46 @@
 Performance Monitoring and Metrics
 """
 from prometheus_fastapi_instrumentator import Instrumentator
+from prometheus_client import Counter, Gauge, Histogram
 from fastapi import FastAPI
 
 from app.core.config import settings
 
+# OCR page latency - use with the pool size to tune OCR_POOL_SIZE
+OCR_PAGE_SECONDS = Histogram(
+    "docosphere_ocr_page_seconds",
+    "Time to OCR a single page in the OCR process pool",
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32, 64),
+)
+
+# Pages by extraction path (embedded text layer vs OCR)
+EXTRACTED_PAGES = Counter(
+    "docosphere_extracted_pages_total",
+    "Pages extracted, by source",
+    ["source"],
+)
+
+# Content-hash deduplication hits (stored object reused / processing results reused)
+DEDUP_HITS = Counter(
+    "docosphere_dedup_hits_total",
+    "Uploads deduplicated by SHA-256",
+    ["stage"],
+)
+
+# Cache lookups by the tier that answered (local, redis) or miss
+CACHE_REQUESTS = Counter(
+    "docosphere_cache_requests_total",
+    "Cache lookups, by tier that served them",
+    ["tier"],
+)
+
+# Read replica health (1 = in rotation)
+DB_REPLICA_HEALTHY = Gauge(
+    "docosphere_db_replica_healthy",
+    "Whether a read replica passes its health check",
+    ["replica"],
+)
+
 
 def setup_monitoring(app: FastAPI):
     """Setup Prometheus metrics"""
@@ -3,16 +3,19 @@ FastAPI Main Application - Optimized for Performance
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
-import time
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, replicas
 from app.api.v1.router import api_router
-from app.core.cache import init_cache
+from app.core.cache import init_cache, close_cache
 from app.core.monitoring import setup_monitoring
+from app.core.middleware import BodySizeLimitMiddleware, ProcessTimeMiddleware, SelectiveGZipMiddleware
+from app.services.processing_worker import start_worker, stop_worker
+from app.services.ocr_pool import shutdown_executor
+from app.services.storage import close_storage, get_storage
+from app.services.status_events import broker
 
 
 @asynccontextmanager
@@ -20,11 +23,20 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     await init_db()
+    await replicas.start()
     await init_cache()
+    await broker.start()
+    get_storage()  # fail fast on a misconfigured storage backend
     setup_monitoring(app)
+    await start_worker()
     yield
     # Shutdown
-    pass
+    await stop_worker()
+    await broker.stop()
+    await close_cache()
+    shutdown_executor()
+    await close_storage()
+    await replicas.stop()
 
 
 # Create FastAPI app with optimizations
@@ -38,6 +50,14 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Single uploads are refused while the body arrives, before it is spooled;
+# added first so CORS headers still reach the browser on the 413
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_body_size=settings.MAX_UPLOAD_SIZE + settings.UPLOAD_FORM_OVERHEAD,
+    detail=f"File exceeds the {settings.MAX_UPLOAD_SIZE // (1024 * 1024)} MB upload limit",
+)
+
 # Middleware for performance
 app.add_middleware(
     CORSMiddleware,
@@ -48,18 +68,11 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# GZip compression for responses
-app.add_middleware(GZipMiddleware, minimum_size=1000)
-
+# GZip compression for responses (file downloads are sent as-is)
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000)
 
 # Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+app.add_middleware(ProcessTimeMiddleware)
 
 
 # Include routers
@@ -69,7 +82,10 @@ app.include_router(api_router, prefix="/api/v1")
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "docosphere-api"}
+    health = {"status": "healthy", "service": "docosphere-api"}
+    if replicas.enabled:
+        health["replicas"] = ["healthy" if ok else "unhealthy" for ok in replicas.healthy]
+    return health
 
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
 from app.models.document import Document
 from app.models.user import User
 from app.models.role import Role, UserRole
+from app.models.job import ProcessingJob
+from app.models.content import DocumentContent
+from app.models.search import DocumentSearch
 
-__all__ = ["Document", "User", "Role", "UserRole"]
+__all__ = ["Document", "User", "Role", "UserRole", "ProcessingJob", "DocumentContent", "DocumentSearch"]
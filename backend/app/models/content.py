@@ -0,0 +1,27 @@
+"""
+Document Content Model - Extracted Text Side Table
+
+OCR text is kept out of the hot `documents` table: rows there stay small,
+so status polls, list scans and index lookups never page large TEXT values
+through the buffer cache. Text is stored compressed (see
+app.services.content_store) and only loaded when it is actually needed.
+"""
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, LargeBinary, JSON
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class DocumentContent(Base):
+    __tablename__ = "document_contents"
+    
+    document_id = Column(String(36), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True)
+    codec = Column(String(10), nullable=False)  # zstd, zlib, none
+    text_data = Column(LargeBinary, nullable=False)  # compressed UTF-8 text
+    text_size = Column(Integer, nullable=False)  # uncompressed bytes
+    stored_size = Column(Integer, nullable=False)  # compressed bytes
+    page_offsets = Column(JSON, nullable=True)  # character offset where each page starts
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<DocumentContent(document_id={self.document_id}, codec={self.codec}, {self.stored_size}/{self.text_size})>"
@@ -2,7 +2,7 @@
 Document Model - Optimized with Indexes
 """
 from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey, Index, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import uuid
 
@@ -18,6 +18,8 @@ class Document(Base):
     file_path = Column(String(1000), nullable=False)
     file_type = Column(String(50), nullable=False, index=True)
     file_size = Column(Integer, nullable=False)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the file
+    batch_id = Column(String(36), nullable=True, index=True)  # bulk upload this came from
     
     # Metadata
     language = Column(String(10), nullable=True, index=True)
@@ -27,7 +29,11 @@ class Document(Base):
     
     # Processing status
     status = Column(String(50), default="pending", index=True)  # pending, processing, completed, failed
-    ocr_text = Column(Text, nullable=True)
+    pages_done = Column(Integer, nullable=True)  # OCR progress
+    page_count = Column(Integer, nullable=True)
+    # Legacy inline OCR text: new text lives in document_contents. Left in place
+    # (never loaded) until `python -m app.scripts.migrate_contents` moves it.
+    legacy_ocr_text = deferred(Column("ocr_text", Text, nullable=True))
     vector_id = Column(String(200), nullable=True, index=True)  # Pinecone vector ID
     
     # Relationships
@@ -40,6 +46,10 @@ class Document(Base):
         Index("idx_document_status_created", "status", "created_at"),
         Index("idx_document_user_status", "uploaded_by", "status"),
         Index("idx_document_language_status", "language", "status"),
+        Index("idx_document_user_deadline", "uploaded_by", "extracted_deadline"),
+        # Keyset pagination of a user's documents (optionally by status)
+        Index("idx_document_user_created", "uploaded_by", "created_at", "id"),
+        Index("idx_document_user_status_created", "uploaded_by", "status", "created_at", "id"),
     )
     
     def __repr__(self):
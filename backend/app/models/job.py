@@ -0,0 +1,40 @@
+"""
+Processing Job Model - Durable Work Queue
+"""
+from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey, Index
+from datetime import datetime
+import uuid
+
+from app.core.database import Base
+
+
+class ProcessingJob(Base):
+    __tablename__ = "processing_jobs"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    document_id = Column(String(36), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
+    
+    # Queue state
+    status = Column(String(20), default="queued", nullable=False)  # queued, running, succeeded, dead
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
+    
+    # Lease held by the worker currently running the job
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Indexes for claiming work and reclaiming expired leases
+    __table_args__ = (
+        Index("idx_job_status_run_after", "status", "run_after"),
+        Index("idx_job_status_locked_until", "status", "locked_until"),
+    )
+    
+    def __repr__(self):
+        return f"<ProcessingJob(id={self.id}, document_id={self.document_id}, status={self.status})>"
@@ -0,0 +1,24 @@
+"""
+Document Search Model - Full-Text Index Source
+
+One row per processed document with the text the search index is built
+from. On SQLite an FTS5 table uses this as its external content (kept in
+sync by triggers); on Postgres a generated `tsvector` column with a GIN
+index is added to it. Both are created by app.services.search_service.
+"""
+from sqlalchemy import Column, String, Integer, Text, ForeignKey
+
+from app.core.database import Base
+
+
+class DocumentSearch(Base):
+    __tablename__ = "document_search"
+    
+    # Integer key: FTS5 external content needs a stable rowid
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(String(36), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, unique=True)
+    title = Column(Text, nullable=True)
+    body = Column(Text, nullable=True)
+    
+    def __repr__(self):
+        return f"<DocumentSearch(document_id={self.document_id})>"
@@ -0,0 +1,185 @@
+"""
+Deadline Backfill - Re-extract deadlines from stored OCR text
+
+Applies the current deadline patterns to existing documents without
+re-running OCR:
+
+    python -m app.scripts.backfill_deadlines --workers 8 --batch-size 1000
+
+Documents are streamed from the `documents` table in keyset order (by id),
+extraction runs in a process pool, and `extracted_deadline` and the
+`deadlines` metadata are written back with one bulk UPDATE per batch, the
+same way the processing pipeline sets them: a document where no upcoming
+deadline is found keeps its indexed date. Progress is checkpointed after every batch,
+so an interrupted run continues where it stopped when started again.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import or_, select, update
+
+from app.core.database import AsyncSessionLocal
+from app.models.content import DocumentContent
+from app.models.document import Document
+from app.services.content_store import content_text
+from app.services.deadline_extractor import best_deadline, extract_deadlines_batch
+
+logger = logging.getLogger("backfill_deadlines")
+
+DEFAULT_CHECKPOINT = ".backfill_deadlines.json"
+
+
+def _extract_chunk(contents: list[tuple], now: datetime) -> list[tuple[Optional[datetime], list[dict]]]:
+    """(best upcoming deadline, deadline metadata) per text (runs in a pool process, decompressing there)"""
+    texts = [content_text(*content) or "" for content in contents]
+    results = []
+    for found in extract_deadlines_batch(texts, future_only=True, now=now):
+        best = best_deadline(found)
+        results.append((best.date if best else None, [d.to_dict() for d in found[:50]]))
+    return results
+
+
+def _load_checkpoint(path: Path) -> dict:
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"last_id": "", "processed": 0, "updated": 0}
+
+
+def _save_checkpoint(path: Path, state: dict):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state))
+    tmp.replace(path)
+
+
+async def _fetch_batch(last_id: str, batch_size: int) -> list[tuple[str, tuple, Optional[datetime], dict]]:
+    """(id, (codec, compressed text, legacy text), deadline, metadata) for the next documents with text"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(
+                Document.id,
+                DocumentContent.codec,
+                DocumentContent.text_data,
+                Document.legacy_ocr_text,
+                Document.extracted_deadline,
+                Document.extra_metadata,
+            )
+            .outerjoin(DocumentContent, DocumentContent.document_id == Document.id)
+            .where(
+                Document.id > last_id,
+                or_(DocumentContent.text_data.is_not(None), Document.legacy_ocr_text.is_not(None)),
+            )
+            .order_by(Document.id)
+            .limit(batch_size)
+        )
+        return [
+            (
+                row.id,
+                (row.codec, row.text_data, row.legacy_ocr_text),
+                row.extracted_deadline,
+                row.extra_metadata or {},
+            )
+            for row in result.all()
+        ]
+
+
+async def _write_batch(changes: list[dict]):
+    if not changes:
+        return
+    async with AsyncSessionLocal() as db:
+        # ORM bulk UPDATE by primary key: one executemany per batch
+        await db.execute(update(Document), changes)
+        await db.commit()
+
+
+async def backfill(
+    batch_size: int,
+    workers: int,
+    checkpoint: Path,
+    restart: bool = False,
+) -> dict:
+    state = {"last_id": "", "processed": 0, "updated": 0} if restart else _load_checkpoint(checkpoint)
+    now = datetime.now()
+    loop = asyncio.get_running_loop()
+    chunk_size = max(1, batch_size // workers)
+    started = time.perf_counter()
+    run_processed = 0
+
+    if state["last_id"]:
+        logger.info("Resuming after id %s (%s documents done)", state["last_id"], state["processed"])
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        batch = await _fetch_batch(state["last_id"], batch_size)
+        while batch:
+            batch_started = time.perf_counter()
+
+            # Fetch the next batch while this one is being extracted
+            next_batch = asyncio.ensure_future(_fetch_batch(batch[-1][0], batch_size))
+
+            contents = [content for _, content, _, _ in batch]
+            chunks = await asyncio.gather(*(
+                loop.run_in_executor(pool, _extract_chunk, contents[i:i + chunk_size], now)
+                for i in range(0, len(contents), chunk_size)
+            ))
+            extracted = [result for chunk in chunks for result in chunk]
+
+            changes = []
+            for (doc_id, _, current, metadata), (deadline, found) in zip(batch, extracted):
+                # Like the pipeline: keep the indexed date when nothing upcoming is found
+                deadline = deadline or current
+                if deadline != current or metadata.get("deadlines") != found:
+                    changes.append({
+                        "id": doc_id,
+                        "extracted_deadline": deadline,
+                        "extra_metadata": {**metadata, "deadlines": found},
+                    })
+            await _write_batch(changes)
+
+            state["last_id"] = batch[-1][0]
+            state["processed"] += len(batch)
+            state["updated"] += len(changes)
+            _save_checkpoint(checkpoint, state)
+
+            run_processed += len(batch)
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "%s documents (%s updated) - batch %.0f docs/s, overall %.0f docs/s",
+                state["processed"],
+                state["updated"],
+                len(batch) / max(time.perf_counter() - batch_started, 1e-9),
+                run_processed / max(elapsed, 1e-9),
+            )
+            batch = await next_batch
+
+    elapsed = time.perf_counter() - started
+    state["docs_per_second"] = round(run_processed / max(elapsed, 1e-9), 1)
+    logger.info(
+        "Backfill complete: %s documents, %s updated, %.1f docs/s",
+        state["processed"],
+        state["updated"],
+        state["docs_per_second"],
+    )
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract deadlines from stored OCR text")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", type=Path, default=Path(DEFAULT_CHECKPOINT))
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(backfill(args.batch_size, max(1, args.workers), args.checkpoint, args.restart))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Search Index Backfill - Index documents processed before full-text search
+
+New results are indexed by the processing pipeline; this fills the index
+for documents that already had text:
+
+    python -m app.scripts.build_search_index --batch-size 200 --optimize
+
+Documents with text but no `document_search` row are walked in keyset
+order (by id) and each batch is committed on its own, so the run can be
+interrupted and started again. --optimize merges the FTS5 segments
+afterwards (SQLite only).
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from sqlalchemy import or_, select, text
+
+from app.core.database import AsyncSessionLocal, engine, init_db
+from app.models.content import DocumentContent
+from app.models.document import Document
+from app.models.search import DocumentSearch
+from app.services.content_store import content_text
+from app.services.search_service import index_document
+
+logger = logging.getLogger("build_search_index")
+
+
+async def _fetch_batch(last_id: str, batch_size: int) -> list:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(
+                Document.id,
+                Document.title,
+                DocumentContent.codec,
+                DocumentContent.text_data,
+                Document.legacy_ocr_text,
+            )
+            .outerjoin(DocumentContent, DocumentContent.document_id == Document.id)
+            .outerjoin(DocumentSearch, DocumentSearch.document_id == Document.id)
+            .where(
+                Document.id > last_id,
+                DocumentSearch.id.is_(None),
+                or_(DocumentContent.document_id.is_not(None), Document.legacy_ocr_text.is_not(None)),
+            )
+            .order_by(Document.id)
+            .limit(batch_size)
+        )
+        return result.all()
+
+
+async def build(batch_size: int, optimize: bool = False) -> int:
+    await init_db()  # creates the index tables on first run
+    indexed = 0
+    started = time.perf_counter()
+    last_id = ""
+
+    batch = await _fetch_batch(last_id, batch_size)
+    while batch:
+        bodies = await asyncio.to_thread(
+            lambda: [content_text(row.codec, row.text_data, row.legacy_ocr_text) for row in batch]
+        )
+        async with AsyncSessionLocal() as db:
+            for row, body in zip(batch, bodies):
+                await index_document(db, row.id, row.title, body)
+            await db.commit()
+
+        indexed += len(batch)
+        logger.info("%s documents indexed (%.0f docs/s)", indexed, indexed / max(time.perf_counter() - started, 1e-9))
+        last_id = batch[-1].id
+        batch = await _fetch_batch(last_id, batch_size)
+
+    if optimize and engine.dialect.name == "sqlite":
+        logger.info("Optimizing FTS5 index")
+        async with engine.begin() as conn:
+            await conn.execute(text("INSERT INTO document_search_fts(document_search_fts) VALUES ('optimize')"))
+
+    logger.info("Indexed %s documents", indexed)
+    return indexed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index existing documents for full-text search")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--optimize", action="store_true", help="merge FTS5 index segments afterwards (SQLite)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(build(args.batch_size, args.optimize))
+
+
+if __name__ == "__main__":
+    main()
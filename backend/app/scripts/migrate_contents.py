@@ -0,0 +1,157 @@
+"""
+Content Migration - Move inline OCR text into document_contents
+
+Compresses the legacy `documents.ocr_text` column into the
+`document_contents` side table and clears it on the hot table:
+
+    python -m app.scripts.migrate_contents --batch-size 500 --vacuum
+
+Documents are walked in keyset order (by id); each batch is inserted and
+cleared in one transaction, so the run can be interrupted and started
+again at any time (migrated rows no longer have inline text). The report
+compares text vs stored bytes, the size of the `documents` table and the
+time of a full scan of it, before and after. Without --vacuum, SQLite and
+Postgres keep the freed pages, so the table size barely changes until the
+next VACUUM.
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import func, select, text, update
+
+from app.core.database import AsyncSessionLocal, engine, init_db
+from app.models.content import DocumentContent
+from app.models.document import Document
+from app.services.content_store import build_content
+
+logger = logging.getLogger("migrate_contents")
+
+
+async def _table_bytes() -> Optional[int]:
+    """On-disk size of the documents table, if the database can tell us"""
+    queries = {
+        "sqlite": "SELECT SUM(pgsize) FROM dbstat WHERE name = 'documents'",
+        "postgresql": "SELECT pg_total_relation_size('documents')",
+    }
+    query = queries.get(engine.dialect.name)
+    if not query:
+        return None
+    try:
+        async with engine.connect() as conn:
+            return await conn.scalar(text(query))
+    except Exception:
+        # e.g. SQLite built without the dbstat virtual table
+        return None
+
+
+async def _scan_seconds(repeat: int = 3) -> float:
+    """Best-of-N time for a full scan of the documents table"""
+    best = float("inf")
+    async with AsyncSessionLocal() as db:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            # file_size isn't indexed, so this reads every row
+            await db.scalar(select(func.count()).select_from(Document).where(Document.file_size >= 0))
+            best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def _measure() -> dict:
+    return {"table_bytes": await _table_bytes(), "scan_seconds": round(await _scan_seconds(), 4)}
+
+
+async def _fetch_batch(last_id: str, batch_size: int) -> list[tuple[str, str, bool]]:
+    """(id, inline text, has a content row) for the next documents with inline text"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Document.id, Document.legacy_ocr_text, DocumentContent.document_id.is_not(None))
+            .outerjoin(DocumentContent, DocumentContent.document_id == Document.id)
+            .where(Document.id > last_id, Document.legacy_ocr_text.is_not(None))
+            .order_by(Document.id)
+            .limit(batch_size)
+        )
+        return [tuple(row) for row in result.all()]
+
+
+async def _vacuum():
+    statement = "VACUUM FULL documents" if engine.dialect.name == "postgresql" else "VACUUM"
+    logger.info("Running %s", statement)
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql(statement)
+
+
+async def migrate(batch_size: int, vacuum: bool = False) -> dict:
+    await init_db()  # creates document_contents on first run
+    before = await _measure()
+    logger.info("Before: %s", before)
+
+    state = {"migrated": 0, "text_bytes": 0, "stored_bytes": 0}
+    started = time.perf_counter()
+    last_id = ""
+
+    batch = await _fetch_batch(last_id, batch_size)
+    while batch:
+        # A content row written since the upgrade wins over the old inline text
+        contents = await asyncio.to_thread(
+            lambda: [build_content(doc_id, body) for doc_id, body, has_content in batch if not has_content]
+        )
+        async with AsyncSessionLocal() as db:
+            db.add_all(contents)
+            await db.execute(
+                update(Document)
+                .where(Document.id.in_([doc_id for doc_id, _, _ in batch]))
+                .values(legacy_ocr_text=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        state["migrated"] += len(batch)
+        state["text_bytes"] += sum(c.text_size for c in contents)
+        state["stored_bytes"] += sum(c.stored_size for c in contents)
+        logger.info(
+            "%s documents migrated (%.0f docs/s)",
+            state["migrated"],
+            state["migrated"] / max(time.perf_counter() - started, 1e-9),
+        )
+        last_id = batch[-1][0]
+        batch = await _fetch_batch(last_id, batch_size)
+
+    if vacuum:
+        await _vacuum()
+
+    after = await _measure()
+    state["ratio"] = round(state["text_bytes"] / state["stored_bytes"], 2) if state["stored_bytes"] else None
+    state["before"], state["after"] = before, after
+    logger.info(
+        "Migrated %s documents: %s text bytes stored as %s (%sx)",
+        state["migrated"],
+        state["text_bytes"],
+        state["stored_bytes"],
+        state["ratio"],
+    )
+    logger.info(
+        "documents table: %s -> %s bytes, full scan %.4fs -> %.4fs",
+        before["table_bytes"],
+        after["table_bytes"],
+        before["scan_seconds"],
+        after["scan_seconds"],
+    )
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move inline OCR text into document_contents")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--vacuum", action="store_true", help="reclaim the freed space afterwards (locks the table)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(migrate(args.batch_size, args.vacuum))
+
+
+if __name__ == "__main__":
+    main()
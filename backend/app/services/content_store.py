@@ -0,0 +1,162 @@
+"""
+Content Store - Compressed Extracted Text
+
+Reads and writes `document_contents`. Text is compressed with zstd when the
+optional `zstandard` package is installed, otherwise zlib; the codec is
+stored per row, so both can coexist. Rows not yet moved by
+`app.scripts.migrate_contents` are read from the legacy inline column.
+"""
+import asyncio
+import zlib
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.content import DocumentContent
+from app.models.document import Document
+
+try:
+    import zstandard  # type: ignore
+
+    _HAS_ZSTD = True
+except Exception:
+    zstandard = None
+    _HAS_ZSTD = False
+
+
+def compress_text(text: str) -> tuple[str, bytes]:
+    """(codec, compressed bytes) for a text"""
+    raw = text.encode("utf-8")
+    codec = settings.CONTENT_CODEC
+    if codec == "none":
+        return "none", raw
+    if codec == "zstd" and _HAS_ZSTD:
+        return "zstd", zstandard.ZstdCompressor(level=settings.CONTENT_ZSTD_LEVEL).compress(raw)
+    return "zlib", zlib.compress(raw, 6)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if not _HAS_ZSTD:
+            raise RuntimeError("zstandard is required to read zstd-compressed content")
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == "zlib":
+        raw = zlib.decompress(data)
+    else:
+        raw = data
+    return raw.decode("utf-8")
+
+
+def content_text(codec: Optional[str], data: Optional[bytes], legacy: Optional[str] = None) -> Optional[str]:
+    """Text from an outer-joined content row, else the legacy inline column"""
+    if data is not None:
+        return decompress_text(codec, data)
+    return legacy
+
+
+def build_content(document_id: str, text: str, page_offsets: Optional[list[int]] = None) -> DocumentContent:
+    codec, data = compress_text(text)
+    return DocumentContent(
+        document_id=document_id,
+        codec=codec,
+        text_data=data,
+        text_size=len(text.encode("utf-8")),
+        stored_size=len(data),
+        page_offsets=page_offsets,
+    )
+
+
+async def save_text(
+    db: AsyncSession,
+    document_id: str,
+    text: str,
+    page_offsets: Optional[list[int]] = None,
+    content: Optional[DocumentContent] = None,
+) -> DocumentContent:
+    """Insert or replace a document's text (caller commits).
+
+    Pass the row returned by a previous call to update it in place, which
+    saves the SELECT that `merge` issues.
+    """
+    built = await asyncio.to_thread(build_content, str(document_id), text, page_offsets)
+    if content is None:
+        return await db.merge(built)
+    content.codec = built.codec
+    content.text_data = built.text_data
+    content.text_size = built.text_size
+    content.stored_size = built.stored_size
+    content.page_offsets = built.page_offsets
+    return content
+
+
+async def load_content(db: AsyncSession, document_id: str) -> Optional[tuple[str, list[int]]]:
+    """(text, page offsets) for a document, or None if it has no text"""
+    result = await db.execute(
+        select(
+            DocumentContent.codec,
+            DocumentContent.text_data,
+            DocumentContent.page_offsets,
+            Document.legacy_ocr_text,
+        )
+        .select_from(Document)
+        .outerjoin(DocumentContent, DocumentContent.document_id == Document.id)
+        .where(Document.id == str(document_id))
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    text = await asyncio.to_thread(content_text, row.codec, row.text_data, row.legacy_ocr_text)
+    if text is None:
+        return None
+    return text, row.page_offsets or []
+
+
+async def load_text(db: AsyncSession, document_id: str) -> Optional[str]:
+    """A document's extracted text, decompressed"""
+    content = await load_content(db, document_id)
+    return content[0] if content else None
+
+
+async def copy_contents(db: AsyncSession, sources: dict[str, str]):
+    """Copy text to documents from their duplicates ({target_id: source_id}).
+
+    Compressed bytes are copied as they are; nothing is recompressed.
+    """
+    if not sources:
+        return
+
+    result = await db.execute(
+        select(
+            Document.id,
+            DocumentContent.codec,
+            DocumentContent.text_data,
+            DocumentContent.text_size,
+            DocumentContent.stored_size,
+            DocumentContent.page_offsets,
+            Document.legacy_ocr_text,
+        )
+        .outerjoin(DocumentContent, DocumentContent.document_id == Document.id)
+        .where(Document.id.in_(set(sources.values())))
+    )
+    rows = {row.id: row for row in result.all()}
+
+    await db.execute(
+        delete(DocumentContent).where(DocumentContent.document_id.in_(list(sources)))
+    )
+    for target_id, source_id in sources.items():
+        row = rows.get(source_id)
+        if row is None:
+            continue
+        if row.text_data is not None:
+            db.add(DocumentContent(
+                document_id=target_id,
+                codec=row.codec,
+                text_data=row.text_data,
+                text_size=row.text_size,
+                stored_size=row.stored_size,
+                page_offsets=row.page_offsets,
+            ))
+        elif row.legacy_ocr_text is not None:
+            db.add(await asyncio.to_thread(build_content, target_id, row.legacy_ocr_text))
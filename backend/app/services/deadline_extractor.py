@@ -1,49 +1,179 @@
 """
 Deadline Extractor - Extract deadlines from text
+
+All date shapes are folded into one precompiled regex, so the text is scanned
+once. Candidates are parsed synchronously (no dateutil, no thread hops) and
+every match is returned with its character offset and a confidence score.
 """
 import re
-from datetime import datetime, timedelta
 import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH_RE = (
+    r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|"
+    r"aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+)
+_KEYWORD_RE = (
+    r"deadline|due(?:\s+date)?|submit(?:ted)?\s+by|submission\s+by|"
+    r"last\s+date(?:\s+(?:for|of)\s+\w+)?|on\s+or\s+before|not\s+later\s+than"
+)
+
+# keyword (optional) + one of: 31/12/2025, 31-12-25, 31.12.2025,
+# 31st December 2025, December 31, 2025
+_DEADLINE_PATTERN = re.compile(
+    rf"(?:(?P<keyword>{_KEYWORD_RE})\s*[:,\-]?\s*(?:is\s+|on\s+|by\s+)?)?"
+    rf"(?<!\d)(?:"
+    rf"(?P<day>\d{{1,2}})(?P<sep>[/.\-])(?P<month>\d{{1,2}})(?P=sep)(?P<year>\d{{4}}|\d{{2}})(?!\d)"
+    rf"|(?P<tday>\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?(?P<tmonth>{_MONTH_RE})\.?,?\s+(?P<tyear>\d{{4}})"
+    rf"|(?P<mname>{_MONTH_RE})\.?\s+(?P<mday>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<myear>\d{{4}})"
+    rf")",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class Deadline:
+    date: datetime
+    offset: int  # character offset of the date in the source text
+    text: str  # matched text, including the keyword if any
+    confidence: float
+
+    def to_dict(self) -> dict:
+        return {
+            "date": self.date.isoformat(),
+            "offset": self.offset,
+            "text": self.text,
+            "confidence": self.confidence,
+        }
+
+
+def _year(value: str) -> int:
+    year = int(value)
+    return 2000 + year if year < 100 else year
+
+
+def _parse(match: re.Match) -> Optional[tuple[datetime, float, int]]:
+    """(date, confidence, offset) for a regex match, or None if not a real date"""
+    confidence = 0.9 if match.group("keyword") else 0.5
+
+    try:
+        if match.group("day"):
+            day, month = int(match.group("day")), int(match.group("month"))
+            year = _year(match.group("year"))
+            if len(match.group("year")) == 2:
+                confidence -= 0.1
+            offset = match.start("day")
+            try:
+                # Day-first (Indian convention), month-first only if that's impossible
+                return datetime(year, month, day), confidence, offset
+            except ValueError:
+                return datetime(year, day, month), confidence - 0.15, offset
+
+        if match.group("tday"):
+            day, month_name, year = match.group("tday"), match.group("tmonth"), match.group("tyear")
+            offset = match.start("tday")
+        else:
+            day, month_name, year = match.group("mday"), match.group("mname"), match.group("myear")
+            offset = match.start("mname")
+        month = _MONTHS[month_name[:3].lower()]
+        return datetime(int(year), month, int(day)), min(confidence + 0.05, 1.0), offset
+    except ValueError:
+        return None
+
 
-try:
-    from dateutil import parser
-    HAS_DATEUTIL = True
-except ImportError:
-    HAS_DATEUTIL = False
+def extract_deadlines(
+    text: str,
+    future_only: bool = False,
+    now: Optional[datetime] = None,
+) -> list[Deadline]:
+    """Every date in the text, in order of appearance"""
+    if not text:
+        return []
+
+    now = now or datetime.now()
+    deadlines = []
+    for match in _DEADLINE_PATTERN.finditer(text):
+        parsed = _parse(match)
+        if parsed is None:
+            continue
+        date, confidence, offset = parsed
+        if future_only and date <= now:
+            continue
+        deadlines.append(Deadline(
+            date=date,
+            offset=offset,
+            text=match.group(0),
+            confidence=round(confidence, 2),
+        ))
+    return deadlines
+
+
+def extract_deadlines_batch(
+    texts: Iterable[str],
+    future_only: bool = False,
+    now: Optional[datetime] = None,
+) -> list[list[Deadline]]:
+    """Extract deadlines from many texts in one call (module-level, so it can
+    be shipped to a process pool for backfills)"""
+    now = now or datetime.now()
+    return [extract_deadlines(text, future_only=future_only, now=now) for text in texts]
+
+
+def best_deadline(deadlines: list[Deadline]) -> Optional[Deadline]:
+    """Highest-confidence deadline, earliest in the text on ties"""
+    if not deadlines:
+        return None
+    return max(deadlines, key=lambda d: (d.confidence, -d.offset))
 
 
 class DeadlineExtractor:
-    def __init__(self):
-        # Common deadline patterns
-        self.patterns = [
-            r'deadline[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-            r'due[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-            r'submit[:\s]+by[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-            r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-        ]
-    
+    # Above this size, scanning is moved off the event loop
+    THREAD_THRESHOLD = 200_000
+
+    def extract_all(
+        self,
+        text: str,
+        future_only: bool = False,
+        now: Optional[datetime] = None,
+    ) -> list[Deadline]:
+        """Every deadline in the text with offset and confidence"""
+        return extract_deadlines(text, future_only=future_only, now=now)
+
+    async def extract_all_async(
+        self,
+        text: str,
+        future_only: bool = False,
+        now: Optional[datetime] = None,
+    ) -> list[Deadline]:
+        """`extract_all`, scanning large texts off the event loop"""
+        if len(text) > self.THREAD_THRESHOLD:
+            return await asyncio.to_thread(extract_deadlines, text, future_only, now)
+        return extract_deadlines(text, future_only=future_only, now=now)
+
+    def extract_batch(
+        self,
+        texts: Iterable[str],
+        future_only: bool = False,
+        now: Optional[datetime] = None,
+    ) -> list[list[Deadline]]:
+        """Deadlines for many texts in one call"""
+        return extract_deadlines_batch(texts, future_only=future_only, now=now)
+
     async def extract(self, text: str) -> datetime | None:
-        """Extract deadline from text"""
+        """Extract the most likely upcoming deadline from text"""
         if not text:
             return None
-        
-        # Try to find dates using patterns
-        for pattern in self.patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                date_str = match.group(1) if match.groups() else match.group(0)
-                try:
-                    # Parse date
-                    if HAS_DATEUTIL:
-                        date = await asyncio.to_thread(parser.parse, date_str, fuzzy=True)
-                    else:
-                        # Fallback to simple parsing
-                        from datetime import datetime
-                        date = datetime.strptime(date_str, "%d/%m/%Y")
-                    # Only return future dates
-                    if date > datetime.now():
-                        return date
-                except:
-                    continue
-        
-        return None
+
+        if len(text) > self.THREAD_THRESHOLD:
+            deadlines = await asyncio.to_thread(extract_deadlines, text, True)
+        else:
+            deadlines = extract_deadlines(text, future_only=True)
+
+        best = best_deadline(deadlines)
+        return best.date if best else None
@@ -2,16 +2,63 @@
 Document Service - Optimized Document Operations
 """
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select, func
 from fastapi import UploadFile
-from uuid import UUID
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+from uuid import UUID, uuid4
 import aiofiles
-import os
-from pathlib import Path
 import asyncio
+import os
+import zipfile
+import zlib
+from pathlib import Path, PurePosixPath
 
+from app.core.config import settings
+from app.models.content import DocumentContent
 from app.models.document import Document
-from app.services.supabase_service import SupabaseService
+from app.models.job import ProcessingJob
+from app.services.supabase_service import (
+    FileTooLargeError,
+    StoredFile,
+    SupabaseService,
+    iter_upload,
+    iter_zip_entry,
+)
 from app.services.processing_service import ProcessingService
+from app.services.processing_worker import notify_worker
+from app.services.job_queue import enqueue_new_jobs
+from app.services.search_service import remove_document
+
+_ZIP_TYPES = ("application/zip", "application/x-zip-compressed")
+# Raised while decompressing a damaged, encrypted or unsupported ZIP entry
+_ZIP_ENTRY_ERRORS = (zipfile.BadZipFile, zlib.error, NotImplementedError, RuntimeError, EOFError)
+
+
+class TooManyFilesError(ValueError):
+    """Bulk upload exceeded BULK_MAX_FILES"""
+
+
+@dataclass
+class BulkIngestResult:
+    batch_id: str
+    documents: list[Document] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+
+
+def _is_zip(file: UploadFile) -> bool:
+    return (file.filename or "").lower().endswith(".zip") or file.content_type in _ZIP_TYPES
+
+
+def _skip_entry(info: zipfile.ZipInfo) -> bool:
+    """Directories, encrypted entries and OS metadata (__MACOSX, dotfiles)"""
+    name = info.filename
+    return (
+        info.is_dir()
+        or bool(info.flag_bits & 0x1)
+        or name.startswith("__MACOSX/")
+        or PurePosixPath(name).name.startswith(".")
+    )
 
 
 class DocumentService:
@@ -26,36 +73,155 @@ class DocumentService:
         user_id: UUID,
     ) -> Document:
         """Upload file to Supabase and create document record"""
-        # Upload to Supabase
-        file_path = await self.supabase.upload_file(file, user_id)
+        # Upload to Supabase (content-addressed; duplicate objects are reused)
+        stored = await self.supabase.upload_file(file, user_id)
         
         # Create document record
         document = Document(
             title=file.filename or "Untitled",
             file_name=file.filename or "untitled",
-            file_path=file_path,
-            file_type=file.content_type or "application/octet-stream",
-            file_size=0,  # Will be updated
+            file_path=stored.path,
+            file_type=stored.content_type,
+            file_size=stored.size,
+            content_hash=stored.sha256,
             uploaded_by=user_id,
             status="pending",
         )
         
         self.db.add(document)
+        await self.db.flush()
+        
+        # Duplicate content: reuse OCR text, deadline and summary instead of reprocessing
+        if await self.processing.reuse_duplicate(document):
+            await self.db.commit()
+            await self.db.refresh(document)
+            return document
+        
+        # Queue processing in the same transaction so the job can't be lost
+        await self.processing.process_document_async(document.id, user_id, commit=False)
         await self.db.commit()
         await self.db.refresh(document)
-        
-        # Trigger async processing (fire and forget)
-        asyncio.create_task(
-            self.processing.process_document_async(document.id, user_id)
-        )
+        notify_worker()
         
         return document
     
+    async def bulk_ingest(self, files: list[UploadFile], user_id: UUID) -> BulkIngestResult:
+        """Store many files (ZIP archives are expanded) and queue them as one batch.
+
+        ZIP entries are decompressed straight into the upload pipeline, never
+        extracted to disk. Files are stored BULK_UPLOAD_CONCURRENCY at a time,
+        then every Document row and job is inserted in a single transaction.
+        Files that fail are reported in `errors`; the rest of the batch goes on.
+        """
+        result = BulkIngestResult(batch_id=str(uuid4()))
+        sources: list[tuple[str, AsyncIterator[bytes], Optional[str]]] = []
+        archives: list[zipfile.ZipFile] = []
+        try:
+            for file in files:
+                if _is_zip(file):
+                    try:
+                        archive = await asyncio.to_thread(zipfile.ZipFile, file.file)
+                    except zipfile.BadZipFile:
+                        result.errors.append({"file_name": file.filename, "error": "Invalid ZIP archive"})
+                        continue
+                    archives.append(archive)
+                    for info in archive.infolist():
+                        if _skip_entry(info):
+                            continue
+                        name = PurePosixPath(info.filename).name
+                        if info.file_size > settings.MAX_UPLOAD_SIZE:
+                            result.errors.append({"file_name": name, "error": "File exceeds the upload limit"})
+                            continue
+                        sources.append((name, iter_zip_entry(archive, info), None))
+                else:
+                    name = file.filename or "untitled"
+                    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+                        result.errors.append({"file_name": name, "error": "File exceeds the upload limit"})
+                        continue
+                    sources.append((name, iter_upload(file), file.content_type))
+
+                if len(sources) > settings.BULK_MAX_FILES:
+                    raise TooManyFilesError(len(sources))
+
+            stored = await self._store_all(sources, result.errors)
+        finally:
+            for archive in archives:
+                archive.close()
+
+        result.documents = [
+            Document(
+                title=name[:500],
+                file_name=name[:500],
+                file_path=item.path,
+                file_type=item.content_type,
+                file_size=item.size,
+                content_hash=item.sha256,
+                uploaded_by=user_id,
+                batch_id=result.batch_id,
+                status="pending",
+            )
+            for name, item in stored
+        ]
+        if not result.documents:
+            return result
+
+        # One transaction for the whole batch: rows, reused results and jobs
+        self.db.add_all(result.documents)
+        await self.db.flush()
+        reused = await self.processing.reuse_duplicates(result.documents)
+        queued = enqueue_new_jobs(
+            self.db, [d for d in result.documents if d.id not in reused]
+        )
+        await self.db.commit()
+        if queued:
+            notify_worker()
+
+        return result
+
+    async def _store_all(
+        self,
+        sources: list[tuple[str, AsyncIterator[bytes], Optional[str]]],
+        errors: list[dict],
+    ) -> list[tuple[str, StoredFile]]:
+        """Store upload streams concurrently, collecting per-file errors"""
+        semaphore = asyncio.Semaphore(settings.BULK_UPLOAD_CONCURRENCY)
+
+        async def store(name: str, chunks: AsyncIterator[bytes], content_type: Optional[str]):
+            async with semaphore:
+                try:
+                    return name, await self.supabase.store_stream(chunks, name, content_type)
+                except FileTooLargeError:
+                    errors.append({"file_name": name, "error": "File exceeds the upload limit"})
+                except _ZIP_ENTRY_ERRORS:
+                    errors.append({"file_name": name, "error": "Unreadable ZIP entry"})
+                return None
+
+        # Let every store finish before re-raising: open archives are closed afterwards
+        results = await asyncio.gather(*(store(*source) for source in sources), return_exceptions=True)
+        for r in results:
+            if isinstance(r, BaseException):
+                raise r
+        return [r for r in results if r is not None]
+
     async def delete_document(self, document: Document):
         """Delete document and associated files"""
-        # Delete from Supabase
-        await self.supabase.delete_file(document.file_path)
+        # Delete from Supabase unless another document shares the stored object
+        shared = await self.db.scalar(
+            select(func.count()).select_from(Document).where(
+                Document.file_path == document.file_path,
+                Document.id != document.id,
+            )
+        )
+        if not shared:
+            await self.supabase.delete_file(document.file_path)
         
         # Delete from database
+        await self.db.execute(
+            delete(ProcessingJob).where(ProcessingJob.document_id == document.id)
+        )
+        await self.db.execute(
+            delete(DocumentContent).where(DocumentContent.document_id == document.id)
+        )
+        await remove_document(self.db, document.id)
         await self.db.delete(document)
         await self.db.commit()
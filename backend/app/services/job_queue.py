@@ -0,0 +1,244 @@
+"""
+Job Queue - Durable Processing Jobs
+
+Jobs live in the `processing_jobs` table so they survive restarts and are
+shared by every uvicorn worker. A job is claimed with a conditional UPDATE
+(optimistic lock) which works the same on SQLite and Postgres: only one
+worker's UPDATE matches, so a document is never processed twice at once.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, or_, and_
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.models.document import Document
+from app.models.job import ProcessingJob
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff for the given number of failed attempts"""
+    seconds = settings.JOB_RETRY_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, settings.JOB_RETRY_BACKOFF_MAX_SECONDS))
+
+
+async def enqueue_job(
+    db: AsyncSession,
+    document_id: UUID | str,
+    user_id: UUID | str,
+    commit: bool = True,
+) -> ProcessingJob:
+    """Queue a document for processing (no-op if it already has an active job)"""
+    result = await db.execute(
+        select(ProcessingJob).where(
+            ProcessingJob.document_id == str(document_id),
+            ProcessingJob.status.in_(ACTIVE_STATUSES),
+        )
+    )
+    job = result.scalars().first()
+    if job:
+        return job
+
+    job = ProcessingJob(
+        document_id=str(document_id),
+        user_id=str(user_id),
+        status="queued",
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        run_after=datetime.utcnow(),
+    )
+    db.add(job)
+    if commit:
+        await db.commit()
+    return job
+
+
+def enqueue_new_jobs(db: AsyncSession, documents) -> list[ProcessingJob]:
+    """Queue freshly inserted documents in bulk (they can't have an active job yet)"""
+    now = datetime.utcnow()
+    jobs = [
+        ProcessingJob(
+            document_id=str(document.id),
+            user_id=str(document.uploaded_by),
+            status="queued",
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            run_after=now,
+        )
+        for document in documents
+    ]
+    db.add_all(jobs)
+    return jobs
+
+
+async def claim_next_job(db: AsyncSession, worker_id: str) -> Optional[ProcessingJob]:
+    """Claim the next runnable job, or reclaim one whose lease expired"""
+    now = datetime.utcnow()
+    runnable = or_(
+        and_(ProcessingJob.status == "queued", ProcessingJob.run_after <= now),
+        and_(
+            ProcessingJob.status == "running",
+            ProcessingJob.locked_until < now,
+            ProcessingJob.attempts < ProcessingJob.max_attempts,
+        ),
+    )
+
+    result = await db.execute(
+        select(ProcessingJob.id, ProcessingJob.document_id)
+        .where(runnable)
+        .order_by(ProcessingJob.run_after)
+        .limit(5)
+    )
+    candidates = result.all()
+
+    lease_until = now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+    for job_id, document_id in candidates:
+        claimed = await db.execute(
+            update(ProcessingJob)
+            .where(ProcessingJob.id == job_id, runnable)
+            .values(
+                status="running",
+                attempts=ProcessingJob.attempts + 1,
+                locked_by=worker_id,
+                locked_until=lease_until,
+                heartbeat_at=now,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if claimed.rowcount == 1:
+            # The document goes to "processing" in the same transaction as the claim
+            await db.execute(
+                update(Document)
+                .where(Document.id == document_id)
+                .values(status="processing")
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            return await db.get(ProcessingJob, job_id)
+        await db.commit()
+
+    return None
+
+
+async def bury_expired_jobs(db: AsyncSession) -> list[tuple[str, str]]:
+    """Dead-letter jobs whose worker died on their final attempt.
+
+    Returns the affected (document_id, user_id) pairs.
+    """
+    now = datetime.utcnow()
+    expired = and_(
+        ProcessingJob.status == "running",
+        ProcessingJob.locked_until < now,
+        ProcessingJob.attempts >= ProcessingJob.max_attempts,
+    )
+    result = await db.execute(
+        select(ProcessingJob.id, ProcessingJob.document_id, ProcessingJob.user_id).where(expired)
+    )
+    rows = result.all()
+    if not rows:
+        return []
+
+    await db.execute(
+        update(ProcessingJob)
+        .where(ProcessingJob.id.in_([row.id for row in rows]), expired)
+        .values(
+            status="dead",
+            locked_by=None,
+            locked_until=None,
+            last_error="Lease expired on final attempt",
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return [(row.document_id, row.user_id) for row in rows]
+
+
+async def heartbeat_job(db: AsyncSession, job_id: str, worker_id: str) -> bool:
+    """Extend the lease; returns False if another worker has taken the job over"""
+    now = datetime.utcnow()
+    result = await db.execute(
+        update(ProcessingJob)
+        .where(
+            ProcessingJob.id == job_id,
+            ProcessingJob.locked_by == worker_id,
+            ProcessingJob.status == "running",
+        )
+        .values(
+            locked_until=now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+            heartbeat_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+class LeaseLost(Exception):
+    """Another worker has taken the job over; this worker's results must not be kept"""
+
+
+async def complete_job(db: AsyncSession, job_id: str, worker_id: str, commit: bool = True) -> bool:
+    """Mark a job as succeeded and release its lease.
+
+    Returns False (and changes nothing) if the worker no longer holds the lease.
+    """
+    result = await db.execute(
+        update(ProcessingJob)
+        .where(ProcessingJob.id == job_id, ProcessingJob.locked_by == worker_id)
+        .values(
+            status="succeeded",
+            locked_by=None,
+            locked_until=None,
+            last_error=None,
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+    if commit:
+        await db.commit()
+    return True
+
+
+async def fail_job(
+    db: AsyncSession,
+    job: ProcessingJob,
+    worker_id: str,
+    error: str,
+    commit: bool = True,
+) -> Optional[str]:
+    """Schedule a retry with backoff, or move the job to the dead-letter state.
+
+    Returns the job's new status ("queued" or "dead"), or None if the worker
+    no longer holds the lease.
+    """
+    now = datetime.utcnow()
+    if job.attempts < job.max_attempts:
+        status = "queued"
+        run_after = now + retry_delay(job.attempts)
+    else:
+        status = "dead"
+        run_after = now
+
+    result = await db.execute(
+        update(ProcessingJob)
+        .where(ProcessingJob.id == job.id, ProcessingJob.locked_by == worker_id)
+        .values(
+            status=status,
+            run_after=run_after,
+            locked_by=None,
+            locked_until=None,
+            last_error=error[:4000],
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return None
+    if commit:
+        await db.commit()
+    return status
@@ -0,0 +1,79 @@
+"""
+Language Detection - Script-Based
+
+Every supported language is written in its own script, so counting code
+points per Unicode block is enough to tell them apart. Used to pick the
+tesseract traineddata for a page and to fill `Document.language`.
+"""
+from collections import Counter
+from typing import Optional
+
+# ISO 639-1 code -> tesseract traineddata
+TESSERACT_LANGS = {
+    "en": "eng",
+    "hi": "hin",
+    "ml": "mal",
+    "ta": "tam",
+    "te": "tel",
+}
+
+# Script name reported by tesseract OSD -> ISO 639-1 code
+OSD_SCRIPTS = {
+    "Latin": "en",
+    "Devanagari": "hi",
+    "Malayalam": "ml",
+    "Tamil": "ta",
+    "Telugu": "te",
+}
+
+# Unicode blocks (inclusive) -> ISO 639-1 code
+_SCRIPT_RANGES = (
+    (0x0900, 0x097F, "hi"),  # Devanagari
+    (0x0B80, 0x0BFF, "ta"),  # Tamil
+    (0x0C00, 0x0C7F, "te"),  # Telugu
+    (0x0D00, 0x0D7F, "ml"),  # Malayalam
+)
+
+ALL_TESSERACT_LANGS = "+".join(TESSERACT_LANGS.values())
+
+
+def script_counts(text: str) -> Counter:
+    """Count letters per language script"""
+    counts: Counter = Counter()
+    for ch in text:
+        code = ord(ch)
+        if code < 0x80:
+            if ch.isalpha():
+                counts["en"] += 1
+            continue
+        for start, end, lang in _SCRIPT_RANGES:
+            if start <= code <= end:
+                counts[lang] += 1
+                break
+    return counts
+
+
+def detect_language(text: str, min_chars: int = 20) -> Optional[str]:
+    """Dominant language of the text, or None if there isn't enough of it"""
+    counts = script_counts(text)
+    if sum(counts.values()) < min_chars:
+        return None
+    lang, _ = counts.most_common(1)[0]
+    # Indic documents are usually peppered with English; prefer the Indic script
+    # whenever it is a substantial share of the text.
+    indic = [(n, code) for code, n in counts.items() if code != "en"]
+    if indic:
+        n, code = max(indic)
+        if n * 3 >= counts["en"]:
+            return code
+    return lang
+
+
+def tesseract_langs(lang: Optional[str], include_english: bool = True) -> str:
+    """Traineddata string for a detected language (all languages if unknown)"""
+    if lang not in TESSERACT_LANGS:
+        return ALL_TESSERACT_LANGS
+    langs = [TESSERACT_LANGS[lang]]
+    if include_english and lang != "en":
+        langs.append("eng")
+    return "+".join(langs)
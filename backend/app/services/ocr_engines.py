@@ -0,0 +1,146 @@
+"""
+OCR Engine Pool - Warm Tesseract Instances
+
+`pytesseract` forks a tesseract process and reloads the language models on
+every call. When the optional `tesserocr` binding is installed, each OCR pool
+process instead keeps initialized `PyTessBaseAPI` instances, one per language
+set, and reuses them across pages and documents. Instances are health-checked
+before use and recycled after OCR_ENGINE_MAX_PAGES pages to cap memory growth.
+
+Without tesserocr this falls back to pytesseract, so behaviour is unchanged.
+"""
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+try:  # Optional: in-process tesseract API
+    import tesserocr  # type: ignore
+except Exception:  # pragma: no cover
+    tesserocr = None  # type: ignore
+
+try:  # Optional heavy deps
+    import pytesseract  # type: ignore
+except Exception:  # pragma: no cover
+    pytesseract = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+OSD_KEY = "osd"
+
+
+class _Engine:
+    """One initialized tesseract instance for a fixed language set"""
+
+    def __init__(self, langs: str):
+        self.langs = langs
+        self.pages = 0
+        kwargs = {"path": settings.TESSDATA_PREFIX} if settings.TESSDATA_PREFIX else {}
+        if langs == OSD_KEY:
+            self.api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.OSD_ONLY, **kwargs)
+        else:
+            self.api = tesserocr.PyTessBaseAPI(lang=langs, **kwargs)
+
+    def healthy(self) -> bool:
+        if self.pages >= settings.OCR_ENGINE_MAX_PAGES:
+            return False
+        if self.langs == OSD_KEY:
+            return True
+        try:
+            return self.api.GetInitLanguagesAsString() == self.langs
+        except RuntimeError:
+            return False
+
+    def recognize(self, image) -> str:
+        try:
+            self.api.SetImage(image)
+            return self.api.GetUTF8Text()
+        finally:
+            self.api.Clear()
+            self.pages += 1
+
+    def detect_script(self, image) -> Optional[dict]:
+        try:
+            self.api.SetImage(image)
+            return self.api.DetectOrientationScript()
+        finally:
+            self.api.Clear()
+            self.pages += 1
+
+    def close(self):
+        try:
+            self.api.End()
+        except Exception:
+            pass
+
+
+# Per-process pool, most recently used last
+_engines: "OrderedDict[str, _Engine]" = OrderedDict()
+
+
+def _acquire(langs: str) -> _Engine:
+    engine = _engines.pop(langs, None)
+    if engine is not None and not engine.healthy():
+        logger.info("Recycling tesseract engine %s after %s pages", langs, engine.pages)
+        engine.close()
+        engine = None
+
+    if engine is None:
+        engine = _Engine(langs)
+        while len(_engines) >= settings.OCR_ENGINE_MAX_PER_WORKER:
+            _, evicted = _engines.popitem(last=False)
+            evicted.close()
+
+    _engines[langs] = engine
+    return engine
+
+
+def _discard(langs: str):
+    engine = _engines.pop(langs, None)
+    if engine is not None:
+        engine.close()
+
+
+def recognize(image, langs: str) -> str:
+    """OCR an image with a warm engine for `langs`"""
+    if tesserocr is None:
+        return pytesseract.image_to_string(image, lang=langs)
+
+    engine = _acquire(langs)
+    try:
+        return engine.recognize(image)
+    except RuntimeError:
+        _discard(langs)
+        raise
+
+
+def detect_script(image) -> Optional[tuple[str, float]]:
+    """(script name, confidence) from tesseract OSD, or None if undetectable"""
+    if tesserocr is None:
+        try:
+            osd = pytesseract.image_to_osd(
+                image,
+                config="--psm 0",
+                output_type=pytesseract.Output.DICT,
+            )
+        except pytesseract.TesseractError:  # too little text to classify
+            return None
+        return osd.get("script"), float(osd.get("script_conf", 0))
+
+    engine = _acquire(OSD_KEY)
+    try:
+        osd = engine.detect_script(image)
+    except RuntimeError:
+        _discard(OSD_KEY)
+        return None
+    if not osd:
+        return None
+    return osd.get("script_name"), float(osd.get("script_conf", 0))
+
+
+def close_all():
+    """Release every engine in this process"""
+    while _engines:
+        _, engine = _engines.popitem()
+        engine.close()
@@ -0,0 +1,138 @@
+"""
+OCR Process Pool - Parallel Page OCR Across Cores
+
+Tesseract calls are CPU-bound, so pages are OCR'd in a shared process pool
+instead of threads. Every document submits its pages to the same pool, so
+capacity is shared across concurrent documents and bounded by OCR_POOL_SIZE.
+
+Functions run in the pool must be module-level (picklable) and only depend on
+their arguments: the pool uses the "spawn" start method so workers never
+inherit the parent's event loop, sockets or DB connections.
+"""
+import asyncio
+import atexit
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Optional
+
+from app.core.config import settings
+from app.services import ocr_engines
+from app.services.language import ALL_TESSERACT_LANGS, OSD_SCRIPTS, tesseract_langs
+
+try:  # Optional heavy deps
+    import pytesseract  # type: ignore
+    from PIL import Image  # type: ignore
+    from pdf2image import convert_from_path  # type: ignore
+except Exception:  # pragma: no cover
+    pytesseract = None  # type: ignore
+    Image = None  # type: ignore
+    convert_from_path = None  # type: ignore
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def pool_size() -> int:
+    """Configured pool size (defaults to one process per core)"""
+    return settings.OCR_POOL_SIZE or os.cpu_count() or 1
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Lazily create the per-process OCR pool"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(settings.TESSERACT_CMD,),
+        )
+    return _executor
+
+
+def shutdown_executor():
+    """Shut the pool down (application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_in_pool(func, *args, **kwargs):
+    """Run a module-level function in the OCR pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+def _init_worker(tesseract_cmd: str):
+    if pytesseract is not None and tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    atexit.register(ocr_engines.close_all)
+
+
+def detect_page_langs(image) -> str:
+    """Pick traineddata for a page with tesseract's script detection (OSD).
+
+    OSD runs on a half-size copy and only evaluates the script classifier, which
+    is far cheaper than recognizing with all five language models. Falls back to
+    every language when the script is unknown or detection is unsure.
+    """
+    if not settings.OCR_DETECT_SCRIPT:
+        return ALL_TESSERACT_LANGS
+
+    small = image.reduce(2) if min(image.size) > 1000 else image
+    try:
+        detected = ocr_engines.detect_script(small)
+    finally:
+        if small is not image:
+            small.close()
+
+    if detected is None or detected[1] < settings.OCR_SCRIPT_MIN_CONFIDENCE:
+        return ALL_TESSERACT_LANGS
+    return tesseract_langs(OSD_SCRIPTS.get(detected[0]))
+
+
+def ocr_image_file(path: str, lang: Optional[str] = None) -> tuple[str, float, str]:
+    """OCR an image file. Returns (text, seconds, langs used).
+
+    `lang` forces the traineddata; by default it is detected from the script.
+    """
+    start = time.perf_counter()
+    with Image.open(path) as image:
+        langs = lang or detect_page_langs(image)
+        text = ocr_engines.recognize(image, langs)
+    return text, time.perf_counter() - start, langs
+
+
+def ocr_pdf_page(
+    pdf_path: str,
+    page_number: int,
+    dpi: int,
+    lang: Optional[str] = None,
+) -> tuple[int, str, float, str]:
+    """Render and OCR a single PDF page (1-based).
+
+    Returns (page_number, text, seconds, langs used). Only this page is
+    rasterized (grayscale, which tesseract binarizes anyway), and the bitmap
+    is released before returning.
+    """
+    start = time.perf_counter()
+    images = convert_from_path(
+        pdf_path,
+        dpi=dpi,
+        first_page=page_number,
+        last_page=page_number,
+        grayscale=True,
+    )
+    texts, used = [], []
+    try:
+        for image in images:
+            langs = lang or detect_page_langs(image)
+            texts.append(ocr_engines.recognize(image, langs))
+            used.append(langs)
+    finally:
+        for image in images:
+            image.close()
+    return page_number, "\n".join(texts), time.perf_counter() - start, "+".join(used)
@@ -4,25 +4,96 @@ OCR Service - Optional Text Extraction
 On Python 3.13 we skip heavy OCR deps (Pillow, pytesseract, pdf2image) by
 default. If they are not installed, this service simply returns empty text so
 the rest of the pipeline can still run.
+
+Pages are OCR'd in parallel in the shared process pool (see ocr_pool). PDFs
+are streamed: each pool task renders a single page, and at most
+OCR_PAGE_WINDOW pages of a document are in flight or buffered at once, so
+peak memory does not grow with page count.
+
+Tesseract languages are narrowed per page by script detection (see
+ocr_pool.detect_page_langs) instead of always loading all five models.
+
+Input is never copied to a temp file: locally stored files are OCR'd in
+place, and remote files are downloaded into an anonymous in-memory file
+(memfd) that the pool processes open through /proc.
+
+Born-digital PDFs skip OCR: the embedded text layer is read with poppler's
+pdftotext in one pass, and only pages without usable text are rasterized.
 """
 import asyncio
+import logging
+import os
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 from app.core.config import settings
+from app.core.monitoring import OCR_PAGE_SECONDS, EXTRACTED_PAGES
+from app.services import ocr_pool
 from app.services.supabase_service import SupabaseService
 
 try:  # Optional heavy deps
     import pytesseract  # type: ignore
     from PIL import Image  # type: ignore
-    from pdf2image import convert_from_path  # type: ignore
+    from pdf2image import convert_from_path, pdfinfo_from_path  # type: ignore
 
     _HAS_OCR_DEPS = True
 except Exception:  # pragma: no cover
     pytesseract = None  # type: ignore
     Image = None  # type: ignore
     convert_from_path = None  # type: ignore
+    pdfinfo_from_path = None  # type: ignore
     _HAS_OCR_DEPS = False
 
+logger = logging.getLogger(__name__)
+
+PDF_DPI = 300
+
+# Called in page order as pages finish: (page, page_count)
+PageCallback = Callable[["PageResult", int], Awaitable[None]]
+
+
+@dataclass
+class PageResult:
+    page: int
+    text: str
+    seconds: float
+    source: str = "ocr"  # "ocr" or "text_layer"
+    langs: str = ""  # tesseract traineddata used for this page
+
+
+@dataclass
+class OCRResult:
+    pages: list[PageResult] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(p.text for p in self.pages)
+
+    @property
+    def extraction(self) -> str:
+        """Which path produced the text: "text_layer", "ocr" or "mixed" """
+        sources = {p.source for p in self.pages}
+        if len(sources) == 1:
+            return sources.pop()
+        return "mixed" if sources else "none"
+
+    def stats(self) -> dict:
+        """Per-page timings, stored on the document for pool sizing"""
+        seconds = [round(p.seconds, 3) for p in self.pages if p.source == "ocr"]
+        return {
+            "pages": len(self.pages),
+            "ocr_pages": len(seconds),
+            "text_layer_pages": len(self.pages) - len(seconds),
+            "page_seconds": seconds,
+            "total_seconds": round(sum(seconds), 3),
+            "pool_size": ocr_pool.pool_size(),
+            "langs": dict(Counter(p.langs for p in self.pages if p.source == "ocr")),
+        }
+
 
 class OCRService:
     def __init__(self):
@@ -35,69 +106,167 @@ class OCRService:
 
         In dev without OCR deps, this just returns an empty string.
         """
-        if not _HAS_OCR_DEPS:
-            return ""
+        result = await self.extract(file_path)
+        return result.text
 
-        # Download file from Supabase / local storage
-        file_content = await self.supabase.download_file(file_path)
+    async def extract(
+        self,
+        file_path: str,
+        on_page: Optional[PageCallback] = None,
+        start_page: int = 1,
+    ) -> OCRResult:
+        """Extract text plus per-page timings.
+
+        `on_page` is awaited for each page in order as soon as it is done;
+        `start_page` skips pages already OCR'd by an interrupted run.
+        """
+        if not _HAS_OCR_DEPS:
+            return OCRResult()
 
         # Determine file type
         file_ext = Path(file_path).suffix.lower()
+        if file_ext not in [".png", ".jpg", ".jpeg", ".gif", ".bmp", ".pdf"]:
+            return OCRResult()
 
-        if file_ext in [".png", ".jpg", ".jpeg", ".gif", ".bmp"]:
-            return await self._ocr_image(file_content)
-        if file_ext == ".pdf":
-            return await self._ocr_pdf(file_content)
-        return ""
+        async with self._input_path(file_path) as input_path:
+            if file_ext == ".pdf":
+                result = await self._ocr_pdf(input_path, on_page, start_page)
+            else:
+                result = await self._ocr_image(input_path)
+                if on_page:
+                    for page in result.pages:
+                        await on_page(page, 1)
 
-    async def _ocr_image(self, image_data: bytes) -> str:
-        """OCR from image bytes"""
-        import tempfile
+        for page in result.pages:
+            EXTRACTED_PAGES.labels(source=page.source).inc()
+            if page.source == "ocr":
+                OCR_PAGE_SECONDS.observe(page.seconds)
+        logger.info("OCR %s: %s", file_path, result.stats())
+        return result
 
-        if not _HAS_OCR_DEPS or pytesseract is None or Image is None:
-            return ""
+    @asynccontextmanager
+    async def _input_path(self, file_path: str) -> AsyncIterator[str]:
+        """A path the OCR pool processes can open, without copying local files"""
+        local = self.supabase.local_path(file_path)
+        if local is not None:
+            yield str(local)
+            return
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-            tmp.write(image_data)
-            tmp_path = tmp.name
+        # Remote file: download straight into memory, visible to child processes via /proc
+        if hasattr(os, "memfd_create"):
+            with os.fdopen(os.memfd_create("ocr-input"), "w+b") as buffer:
+                await self.supabase.download_to(file_path, buffer)
+                buffer.flush()
+                yield f"/proc/{os.getpid()}/fd/{buffer.fileno()}"
+            return
 
+        # Platforms without memfd (macOS): fall back to a temp file
+        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file_path).suffix) as tmp:
+            await self.supabase.download_to(file_path, tmp)
+            tmp_path = tmp.name
         try:
-            text = await asyncio.to_thread(
-                pytesseract.image_to_string,
-                Image.open(tmp_path),
-                lang="eng+hin+mal+tam+tel",
-            )
-            return text
+            yield tmp_path
         finally:
             Path(tmp_path).unlink(missing_ok=True)
 
-    async def _ocr_pdf(self, pdf_data: bytes) -> str:
-        """OCR from PDF bytes"""
-        import tempfile
+    async def _ocr_image(self, image_path: str) -> OCRResult:
+        """OCR an image file"""
+        if not _HAS_OCR_DEPS or pytesseract is None or Image is None:
+            return OCRResult()
+
+        text, seconds, langs = await ocr_pool.run_in_pool(
+            ocr_pool.ocr_image_file,
+            image_path,
+        )
+        return OCRResult(pages=[PageResult(page=1, text=text, seconds=seconds, langs=langs)])
 
+    async def _ocr_pdf(
+        self,
+        pdf_path: str,
+        on_page: Optional[PageCallback] = None,
+        start_page: int = 1,
+    ) -> OCRResult:
+        """OCR a PDF file - a sliding window of pages runs in the OCR pool"""
         if not _HAS_OCR_DEPS or pytesseract is None or convert_from_path is None:
-            return ""
+            return OCRResult()
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            tmp.write(pdf_data)
-            tmp_path = tmp.name
+        info = await asyncio.to_thread(pdfinfo_from_path, pdf_path)
+        page_count = int(info.get("Pages", 0))
+        window = max(1, settings.OCR_PAGE_WINDOW or ocr_pool.pool_size())
+        text_layer = await self._read_text_layer(pdf_path, page_count)
+
+        result = OCRResult()
+        pending: dict[asyncio.Future, int] = {}
+        finished: dict[int, PageResult] = {}
+        next_page = max(1, start_page)
+        next_emit = next_page
 
         try:
-            images = await asyncio.to_thread(
-                convert_from_path,
-                tmp_path,
-                dpi=300,
-            )
+            while next_emit <= page_count:
+                # Keep the window full; out-of-order pages count against it too
+                while next_page <= page_count and len(pending) + len(finished) < window:
+                    embedded = text_layer[next_page - 1]
+                    if self._has_text_layer(embedded):
+                        finished[next_page] = PageResult(
+                            page=next_page, text=embedded, seconds=0.0, source="text_layer"
+                        )
+                    else:
+                        future = asyncio.ensure_future(ocr_pool.run_in_pool(
+                            ocr_pool.ocr_pdf_page, pdf_path, next_page, PDF_DPI
+                        ))
+                        pending[future] = next_page
+                    next_page += 1
 
-            texts = []
-            for image in images:
-                text = await asyncio.to_thread(
-                    pytesseract.image_to_string,
-                    image,
-                    lang="eng+hin+mal+tam+tel",
-                )
-                texts.append(text)
+                if next_emit not in finished:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        del pending[future]
+                        page, text, seconds, langs = future.result()
+                        finished[page] = PageResult(
+                            page=page, text=text, seconds=seconds, langs=langs
+                        )
 
-            return "\n\n".join(texts)
+                # Emit completed pages in order and release them
+                while next_emit in finished:
+                    page_result = finished.pop(next_emit)
+                    result.pages.append(page_result)
+                    if on_page:
+                        await on_page(page_result, page_count)
+                    next_emit += 1
         finally:
-            Path(tmp_path).unlink(missing_ok=True)
+            for future in pending:
+                future.cancel()
+
+        return result
+
+    async def _read_text_layer(self, pdf_path: str, page_count: int) -> list[str]:
+        """Embedded text per page via pdftotext (one process for the whole file).
+
+        Returns empty strings (i.e. "OCR everything") if pdftotext is missing
+        or fails, e.g. on encrypted PDFs.
+        """
+        pages = [""] * page_count
+        if not settings.PDF_TEXT_LAYER_ENABLED or page_count == 0:
+            return pages
+
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                settings.PDFTOTEXT_CMD, "-layout", "-enc", "UTF-8", pdf_path, "-",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            stdout, _ = await proc.communicate()
+        except OSError:
+            return pages
+        if proc.returncode != 0:
+            return pages
+
+        # pdftotext terminates every page with a form feed
+        for i, text in enumerate(stdout.decode("utf-8", errors="replace").split("\f")[:page_count]):
+            pages[i] = text
+        return pages
+
+    @staticmethod
+    def _has_text_layer(text: str) -> bool:
+        """A page counts as born-digital if it carries enough real characters"""
+        return sum(1 for ch in text if ch.isalnum()) >= settings.PDF_TEXT_LAYER_MIN_CHARS
@@ -1,85 +1,241 @@
 """
 Processing Service - Async Document Processing
 """
+import logging
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from typing import Optional
 from uuid import UUID
-from fastapi import BackgroundTasks
-import asyncio
 
+from app.core.config import settings
+from app.core.monitoring import DEDUP_HITS
+from app.models.content import DocumentContent
 from app.models.document import Document
-from app.services.ocr_service import OCRService
-from app.services.deadline_extractor import DeadlineExtractor
+from app.models.job import ProcessingJob
+from app.services.ocr_service import OCRService, OCRResult, PageResult
+from app.services.deadline_extractor import DeadlineExtractor, best_deadline
+from app.services.job_queue import enqueue_job
+from app.services.language import detect_language
+from app.services.content_store import copy_contents, load_content, save_text
+from app.services.progress_writer import ProgressWriter
+from app.services.search_service import copy_index, index_document
+from app.services.status_events import publish_progress
+
+logger = logging.getLogger(__name__)
 
 
 class ProcessingService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, progress: Optional[ProgressWriter] = None):
         self.db = db
+        self.progress = progress  # batched per-page progress (worker only)
         self.ocr = OCRService()
         self.deadline_extractor = DeadlineExtractor()
-    
+
     async def process_document_async(
         self,
         document_id: UUID,
         user_id: UUID,
-        background_tasks: BackgroundTasks = None,
-    ):
-        """Process document asynchronously"""
-        if background_tasks:
-            background_tasks.add_task(
-                self._process_document,
-                document_id,
-                user_id
-            )
-        else:
-            # Run in background - use asyncio.create_task for fire-and-forget
-            task = asyncio.create_task(
-                self._process_document(document_id, user_id)
-            )
-            # Don't await, let it run in background
-    
-    async def _process_document(self, document_id: UUID, user_id: UUID):
-        """Internal processing function"""
-        try:
-            # Get document
-            result = await self.db.execute(
-                select(Document).where(
-                    Document.id == document_id,
-                    Document.uploaded_by == user_id
-                )
+        commit: bool = True,
+    ) -> ProcessingJob:
+        """Queue document for processing by the worker pool"""
+        return await enqueue_job(self.db, document_id, user_id, commit=commit)
+
+    async def process_document(
+        self,
+        document_id: UUID,
+        user_id: UUID,
+        commit: bool = True,
+    ) -> Optional[Document]:
+        """Run the processing pipeline (called by the worker that owns the job).
+
+        With commit=False the final results are left for the caller to commit
+        together with the job's completion. Returns the processed document.
+        """
+        # Get document
+        result = await self.db.execute(
+            select(Document).where(
+                Document.id == str(document_id),
+                Document.uploaded_by == str(user_id)
             )
-            document = result.scalar_one_or_none()
-            
-            if not document:
-                return
-            
-            # Update status
-            document.status = "processing"
-            await self.db.commit()
-            
-            # Step 1: OCR
-            ocr_text = await self.ocr.extract_text(document.file_path)
-            document.ocr_text = ocr_text
-            
-            # Step 2: Extract deadline
-            deadline = await self.deadline_extractor.extract(ocr_text)
-            if deadline:
-                document.extracted_deadline = deadline
-            
-            # Step 3 (optional): embeddings/vector storage
-            # Skipped in dev mode / Python 3.13 local setup.
-            document.vector_id = None
-            document.status = "completed"
-            
+        )
+        document = result.scalar_one_or_none()
+
+        if not document:
+            return None
+
+        # Identical content may have finished processing since this job was queued
+        if await self.reuse_duplicate(document):
+            if commit:
+                await self.db.commit()
+            return document
+
+        # The worker's claim already set "processing"; it's written with the
+        # first checkpoint or the results rather than in a commit of its own
+        document.status = "processing"
+
+        # Step 1: OCR (resumes after the last persisted page of an interrupted run)
+        ocr_text, page_offsets, ocr_result, content = await self._run_ocr(document)
+
+        # Step 2: Extract deadlines (all of them; the best upcoming one is indexed).
+        # Scanned before the results are written, so the SQLite writer isn't held meanwhile.
+        deadlines = await self.deadline_extractor.extract_all_async(ocr_text, future_only=True)
+
+        await save_text(self.db, document.id, ocr_text, page_offsets, content=content)
+        await index_document(self.db, document.id, document.title, ocr_text)
+        document.pages_done = document.page_count = len(page_offsets)
+        document.language = detect_language(ocr_text) or document.language
+        document.extra_metadata = {
+            **(document.extra_metadata or {}),
+            "extraction": ocr_result.extraction,
+            "ocr": ocr_result.stats(),
+        }
+
+        best = best_deadline(deadlines)
+        if best:
+            document.extracted_deadline = best.date
+        document.extra_metadata = {
+            **document.extra_metadata,
+            "deadlines": [d.to_dict() for d in deadlines[:50]],
+        }
+
+        # Step 3 (optional): embeddings/vector storage
+        # Skipped in dev mode / Python 3.13 local setup.
+        document.vector_id = None
+        document.status = "completed"
+
+        if self.progress:
+            self.progress.discard(document.id)
+        if commit:
             await self.db.commit()
-            
-        except Exception as e:
-            # Update status to failed
-            result = await self.db.execute(
-                select(Document).where(Document.id == document_id)
+        return document
+
+    async def reuse_duplicate(self, document: Document) -> bool:
+        """Copy results from an already-processed document with the same content hash.
+
+        The `documents` table doubles as the content-addressed result store:
+        completed rows are looked up by the indexed `content_hash`.
+        """
+        if not document.content_hash:
+            return False
+
+        result = await self.db.execute(
+            select(Document)
+            .where(
+                Document.content_hash == document.content_hash,
+                Document.status == "completed",
+                Document.id != document.id,
+            )
+            .order_by(Document.updated_at.desc())
+            .limit(1)
+        )
+        source = result.scalar_one_or_none()
+        if source is None:
+            return False
+
+        self._copy_results(document, source)
+        await copy_contents(self.db, {document.id: source.id})
+        await copy_index(self.db, {document.id: source.id})
+        return True
+
+    async def reuse_duplicates(self, documents: list[Document]) -> set[str]:
+        """Batch form of `reuse_duplicate`: one lookup for many new documents.
+
+        Returns the ids of the documents that were completed from a duplicate.
+        """
+        hashes = {d.content_hash for d in documents if d.content_hash}
+        if not hashes:
+            return set()
+
+        result = await self.db.execute(
+            select(Document)
+            .where(
+                Document.content_hash.in_(hashes),
+                Document.status == "completed",
             )
-            document = result.scalar_one_or_none()
-            if document:
-                document.status = "failed"
+            .order_by(Document.updated_at.desc())
+        )
+        sources = {}
+        for source in result.scalars():
+            sources.setdefault(source.content_hash, source)
+
+        copied = {}
+        for document in documents:
+            source = sources.get(document.content_hash)
+            if source is not None and source.id != document.id:
+                self._copy_results(document, source)
+                copied[document.id] = source.id
+        await copy_contents(self.db, copied)
+        await copy_index(self.db, copied)
+        return set(copied)
+
+    def _copy_results(self, document: Document, source: Document):
+        document.extracted_deadline = source.extracted_deadline
+        document.summary = source.summary
+        document.language = source.language
+        document.pages_done = source.pages_done
+        document.page_count = source.page_count
+        document.extra_metadata = {
+            **(document.extra_metadata or {}),
+            "extraction": (source.extra_metadata or {}).get("extraction"),
+        }
+        document.status = "completed"
+        # The source may belong to another user: logged, never stored in the visible metadata
+        logger.info("Document %s completed from duplicate %s", document.id, source.id)
+        DEDUP_HITS.labels(stage="results").inc()
+
+    async def _run_ocr(self, document: Document) -> tuple[str, list[int], OCRResult, Optional[DocumentContent]]:
+        """OCR the document, checkpointing text every few pages.
+
+        Returns the text, the character offset where each page starts, the
+        OCR result and the content row written by the last checkpoint. Text
+        and offsets are saved together, so the number of offsets is the
+        number of pages a resumed run can skip.
+        """
+        text, offsets = "", []
+        if document.pages_done:
+            saved = await load_content(self.db, document.id)
+            if saved:
+                text, offsets = saved
+        state = {"text": text, "offsets": offsets, "unsaved": 0, "content": None}
+
+        async def on_page(page: PageResult, page_count: int):
+            if state["offsets"] or state["text"]:
+                state["text"] += "\n\n"
+            state["offsets"].append(len(state["text"]))
+            state["text"] += page.text
+            state["unsaved"] += 1
+
+            if state["unsaved"] >= settings.OCR_PROGRESS_EVERY_PAGES and page.page < page_count:
+                state["content"] = await save_text(
+                    self.db, document.id, state["text"], list(state["offsets"]), content=state["content"]
+                )
+                document.pages_done = page.page
+                document.page_count = page_count
+                if self.progress:
+                    self.progress.discard(document.id)
                 await self.db.commit()
-            raise e
+                await publish_progress(document.uploaded_by, document.id, page.page, page_count)
+                state["unsaved"] = 0
+            elif self.progress:
+                self.progress.update(
+                    document.id, document.uploaded_by, pages_done=page.page, page_count=page_count
+                )
+
+        result = await self.ocr.extract(
+            document.file_path,
+            on_page=on_page,
+            start_page=len(offsets) + 1,
+        )
+        return state["text"], state["offsets"], result, state["content"]
+
+    async def set_status(self, document_id: UUID, status: str, commit: bool = True):
+        """Set document status outside the pipeline (retry scheduled, dead-lettered)"""
+        await self.db.execute(
+            update(Document)
+            .where(Document.id == str(document_id))
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+        if commit:
+            await self.db.commit()
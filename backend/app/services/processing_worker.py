@@ -0,0 +1,195 @@
+"""
+Processing Worker - Bounded Pool Draining the Job Queue
+
+Each uvicorn process runs one `ProcessingWorker` with WORKER_CONCURRENCY
+slots. Slots claim jobs from the shared `processing_jobs` table, so a burst
+of uploads waits in the queue instead of starting N OCR runs at once. Every
+job gets its own session from the worker pool (WorkerSessionLocal); nothing
+borrows a request's session.
+
+Writes per job are coalesced: the claim also marks the document
+"processing", the results are committed together with the job's completion
+(and a failure with the document's new status), and per-page progress goes
+through a shared ProgressWriter that batches all running jobs.
+
+A job is only completed or failed while its worker holds the lease;
+otherwise its writes are rolled back. A heartbeat that finds the lease
+taken over cancels the run.
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import WorkerSessionLocal, worker_engine, engine
+from app.models.job import ProcessingJob
+from app.services import job_queue
+from app.services.processing_service import ProcessingService
+from app.services.progress_writer import ProgressWriter
+from app.services.status_events import publish_status
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessingWorker:
+    def __init__(self, concurrency: Optional[int] = None):
+        self.concurrency = max(1, concurrency or settings.WORKER_CONCURRENCY)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self.progress = ProgressWriter()
+
+    async def start(self):
+        """Start the worker slots"""
+        self._stopping.clear()
+        self.progress.start()
+        self._tasks = [
+            asyncio.create_task(self._run_slot(slot), name=f"processing-worker-{slot}")
+            for slot in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        """Stop claiming new jobs and cancel running ones (their leases expire and get retried)"""
+        self._stopping.set()
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.progress.stop()
+
+    def notify(self):
+        """Wake idle slots after a job was enqueued in this process"""
+        self._wakeup.set()
+
+    async def _run_slot(self, slot: int):
+        while not self._stopping.is_set():
+            try:
+                async with WorkerSessionLocal() as db:
+                    job = await job_queue.claim_next_job(db, self.worker_id)
+                    if job is None and slot == 0:
+                        await self._bury_expired(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to claim processing job")
+                job = None
+
+            if job is None:
+                await self._idle()
+                continue
+
+            await publish_status(job.user_id, job.document_id, "processing")
+            await self._execute(job)
+
+    async def _idle(self):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=settings.WORKER_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _bury_expired(self, db):
+        buried = await job_queue.bury_expired_jobs(db)
+        processing = ProcessingService(db)
+        for document_id, _ in buried:
+            await processing.set_status(document_id, "failed", commit=False)
+        if buried:
+            await db.commit()
+        for document_id, user_id in buried:
+            await publish_status(user_id, document_id, "failed")
+
+    async def _execute(self, job: ProcessingJob):
+        # The job runs in its own task so the heartbeat can cancel it if the lease is lost
+        work = asyncio.create_task(self._process(job))
+        lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, work, lost))
+        try:
+            document = await work
+            if document is not None:
+                await publish_status(
+                    job.user_id, job.document_id, document.status, document.pages_done, document.page_count
+                )
+        except job_queue.LeaseLost:
+            # Another worker owns the job now: its results win
+            self.progress.discard(job.document_id)
+            logger.warning("Discarded results of processing job %s: lease was taken over", job.id)
+        except asyncio.CancelledError:
+            work.cancel()
+            self.progress.discard(job.document_id)
+            if not lost.is_set():
+                raise
+            logger.warning("Abandoned processing job %s after losing its lease", job.id)
+        except Exception as e:
+            logger.exception("Processing job %s failed (attempt %s)", job.id, job.attempts)
+            await self._fail(job, f"{type(e).__name__}: {e}")
+        finally:
+            heartbeat.cancel()
+
+    async def _process(self, job: ProcessingJob):
+        async with WorkerSessionLocal() as db:
+            service = ProcessingService(db, progress=self.progress)
+            document = await service.process_document(job.document_id, job.user_id, commit=False)
+            # Results and job completion in one commit, only while this worker holds the lease
+            if not await job_queue.complete_job(db, job.id, self.worker_id, commit=False):
+                await db.rollback()
+                raise job_queue.LeaseLost(job.id)
+            await db.commit()
+        return document
+
+    async def _fail(self, job: ProcessingJob, error: str):
+        self.progress.discard(job.document_id)
+        async with WorkerSessionLocal() as db:
+            status = await job_queue.fail_job(db, job, self.worker_id, error, commit=False)
+            if status is None:
+                # Lease taken over: the new owner decides the document's state
+                await db.rollback()
+                return
+            # Retrying documents go back to pending; only dead-lettered ones are failed
+            document_status = "failed" if status == "dead" else "pending"
+            await ProcessingService(db).set_status(job.document_id, document_status)
+        await publish_status(job.user_id, job.document_id, document_status)
+
+    async def _heartbeat(self, job_id: str, work: asyncio.Task, lost: asyncio.Event):
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            try:
+                async with WorkerSessionLocal() as db:
+                    if not await job_queue.heartbeat_job(db, job_id, self.worker_id):
+                        logger.warning("Lost lease on processing job %s; cancelling it", job_id)
+                        lost.set()
+                        work.cancel()
+                        return
+            except Exception:
+                logger.exception("Heartbeat failed for processing job %s", job_id)
+
+
+worker: Optional[ProcessingWorker] = None
+
+
+async def start_worker():
+    """Start this process's worker pool"""
+    global worker
+    if settings.WORKER_ENABLED and worker is None:
+        worker = ProcessingWorker()
+        await worker.start()
+
+
+async def stop_worker():
+    """Stop this process's worker pool"""
+    global worker
+    if worker is not None:
+        await worker.stop()
+        worker = None
+    if worker_engine is not engine:
+        await worker_engine.dispose()
+
+
+def notify_worker():
+    """Signal that new work is available"""
+    if worker is not None:
+        worker.notify()
@@ -0,0 +1,102 @@
+"""
+Progress Writer - Batched OCR Progress Updates
+
+Per-page progress from every running job is coalesced in memory (only the
+latest value per document is kept) and written every
+WORKER_PROGRESS_FLUSH_SECONDS as one bulk UPDATE, instead of a commit per
+page per document. Each write is also pushed to status event subscribers.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.database import WorkerSessionLocal
+from app.models.document import Document
+from app.services.status_events import publish_progress
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressWriter:
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or settings.WORKER_PROGRESS_FLUSH_SECONDS
+        self._pending: dict[str, dict] = {}
+        self._users: dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def update(self, document_id: str, user_id: str, **values):
+        """Record progress; replaces anything not yet written for the document"""
+        self._pending.setdefault(str(document_id), {}).update(values)
+        self._users[str(document_id)] = str(user_id)
+
+    def discard(self, document_id: str):
+        """Drop unwritten progress (the job is about to write its final state)"""
+        self._pending.pop(str(document_id), None)
+        self._users.pop(str(document_id), None)
+
+    async def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        users, self._users = self._users, {}
+
+        # Bulk UPDATE by primary key needs the same columns in every row
+        groups: dict[tuple, list[dict]] = {}
+        for document_id, values in pending.items():
+            groups.setdefault(tuple(sorted(values)), []).append({"id": document_id, **values})
+
+        try:
+            async with WorkerSessionLocal() as db:
+                for rows in groups.values():
+                    # Only documents still processing: never overwrite a final state.
+                    # Extra WHERE criteria need synchronize_session=None with bulk rows.
+                    await db.execute(
+                        update(Document)
+                        .where(Document.status == "processing")
+                        .execution_options(synchronize_session=None),
+                        rows,
+                    )
+                await db.commit()
+        except BaseException:
+            # Put the progress back for the next flush unless newer values arrived meanwhile
+            for document_id, values in pending.items():
+                if document_id not in self._pending:
+                    self._pending[document_id] = values
+                    self._users[document_id] = users[document_id]
+            raise
+
+        for document_id, values in pending.items():
+            if "pages_done" in values:
+                await publish_progress(
+                    users[document_id], document_id, values["pages_done"], values.get("page_count")
+                )
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to write processing progress")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="progress-writer")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to write processing progress")
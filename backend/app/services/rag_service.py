@@ -7,8 +7,7 @@ from typing import Optional
 import asyncio
 
 from app.core.config import settings
-from app.models.document import Document
-from sqlalchemy import select
+from app.services.content_store import load_text
 
 
 class RAGService:
@@ -56,9 +55,7 @@ class RAGService:
         """
         ocr_text = ""
         if document_id:
-            result = await self.db.execute(select(Document).where(Document.id == str(document_id)))
-            doc = result.scalar_one_or_none()
-            ocr_text = (doc.ocr_text or "") if doc else ""
+            ocr_text = await load_text(self.db, document_id) or ""
 
         # Full RAG path (only if optional deps are present & configured)
         if self._has_gemini and self._has_pinecone and self.index is not None and self.model is not None:
@@ -98,10 +95,9 @@ class RAGService:
         language: str = "en",
     ) -> str:
         """Generate multilingual summary (Gemini if configured; otherwise dev fallback)."""
-        result = await self.db.execute(select(Document).where(Document.id == str(document_id)))
-        document = result.scalar_one_or_none()
+        ocr_text = await load_text(self.db, document_id)
         
-        if not document or not document.ocr_text:
+        if not ocr_text:
             return "No content available for summary."
 
         if self._has_gemini and self.model is not None:
@@ -109,12 +105,12 @@ class RAGService:
 Provide a concise summary covering the main points.
 
 Document:
-{document.ocr_text[:5000]}
+{ocr_text[:5000]}
 
 Summary:"""
             response = await asyncio.to_thread(self.model.generate_content, prompt)
             return response.text
 
         # Dev fallback: first ~600 chars
-        text = document.ocr_text.strip().replace("\n", " ")
+        text = ocr_text.strip().replace("\n", " ")
         return text[:600] + ("..." if len(text) > 600 else "")
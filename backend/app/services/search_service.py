@@ -0,0 +1,254 @@
+"""
+Search Service - Full-Text Search over Extracted Text
+
+`document_search` holds each processed document's title and text. On
+SQLite an FTS5 table indexes it as external content (triggers keep the two
+in step) and results are ranked with bm25; on Postgres a generated
+`tsvector` column (title weighted above body) is indexed with GIN and
+ranked with ts_rank_cd. The text is kept uncompressed here, unlike
+`document_contents`, so snippets can be cut by the database itself.
+
+The index is written in the same transaction as the text it mirrors.
+"""
+import html
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import bindparam, delete, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.document import Document
+from app.models.search import DocumentSearch
+
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+# The database marks matches with control characters; the text around them
+# is escaped before they become tags, so document text never reaches a
+# client as markup
+_MATCH_OPEN = "\x02"
+_MATCH_CLOSE = "\x03"
+
+_SQLITE_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS document_search_fts USING fts5(
+        title, body,
+        content='document_search', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS document_search_ai AFTER INSERT ON document_search BEGIN
+        INSERT INTO document_search_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS document_search_ad AFTER DELETE ON document_search BEGIN
+        INSERT INTO document_search_fts(document_search_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS document_search_au AFTER UPDATE ON document_search BEGIN
+        INSERT INTO document_search_fts(document_search_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO document_search_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+)
+
+
+def _pg_config() -> str:
+    config = settings.SEARCH_PG_CONFIG
+    if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_.]*", config):
+        raise ValueError(f"Invalid SEARCH_PG_CONFIG: {config!r}")
+    return config
+
+
+def _postgres_ddl() -> tuple[str, ...]:
+    config = _pg_config()
+    return (
+        f"""
+        ALTER TABLE document_search ADD COLUMN IF NOT EXISTS tsv tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('{config}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{config}', coalesce(body, '')), 'B')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_document_search_tsv ON document_search USING GIN (tsv)",
+    )
+
+
+async def create_search_index(conn: AsyncConnection):
+    """Create the dialect's index over `document_search` (idempotent; called by init_db)"""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        statements = _SQLITE_DDL
+    elif dialect == "postgresql":
+        statements = _postgres_ddl()
+    else:
+        return
+    for statement in statements:
+        await conn.execute(text(statement))
+
+
+def _upsert(rows):
+    """INSERT ... ON CONFLICT (document_id) DO UPDATE for the engine's dialect"""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(DocumentSearch)
+    stmt = stmt.values(rows) if isinstance(rows, list) else stmt.from_select(
+        ["document_id", "title", "body"], rows
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[DocumentSearch.document_id],
+        set_={"title": stmt.excluded.title, "body": stmt.excluded.body},
+    )
+
+
+async def index_document(db: AsyncSession, document_id: str, title: Optional[str], body: str):
+    """Add or replace a document's entry (caller commits)"""
+    await db.execute(_upsert([{"document_id": str(document_id), "title": title, "body": body}]))
+
+
+async def copy_index(db: AsyncSession, sources: dict[str, str]):
+    """Index documents with their duplicates' text ({target_id: source_id})"""
+    for target_id, source_id in sources.items():
+        await db.execute(_upsert(
+            select(Document.id, Document.title, DocumentSearch.body)
+            .join(DocumentSearch, DocumentSearch.document_id == source_id)
+            .where(Document.id == target_id)
+        ))
+
+
+async def remove_document(db: AsyncSession, document_id: str):
+    await db.execute(delete(DocumentSearch).where(DocumentSearch.document_id == str(document_id)))
+
+
+@dataclass
+class SearchFilters:
+    status: Optional[str] = None
+    language: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+    def sql(self, params: dict) -> str:
+        clauses = []
+        for name, clause in (
+            ("status", "d.status = :status"),
+            ("language", "d.language = :language"),
+            ("created_from", "d.created_at >= :created_from"),
+            ("created_to", "d.created_at < :created_to"),
+        ):
+            value = getattr(self, name)
+            if value is not None:
+                params[name] = value
+                clauses.append(clause)
+        return "".join(f" AND {clause}" for clause in clauses)
+
+
+def highlight(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a database snippet, keeping only the match markers as <mark> tags"""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_MATCH_OPEN, SNIPPET_OPEN).replace(_MATCH_CLOSE, SNIPPET_CLOSE)
+
+
+def fts5_query(query: str) -> Optional[str]:
+    """User input as an FTS5 query: every word must match, the last as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in the input are
+    taken literally instead of raising syntax errors.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+_LIGHT_COLUMNS = "d.id, d.title, d.file_name, d.status, d.language, d.created_at, d.extracted_deadline"
+
+
+async def search_documents(
+    db: AsyncSession,
+    user_id: str,
+    query: str,
+    filters: SearchFilters,
+    limit: int = 20,
+    offset: int = 0,
+) -> list:
+    """Best-ranked matches among the user's documents, with highlighted snippets.
+
+    Rows (dicts) carry the listing columns plus `score` (higher is better)
+    and `snippet`, HTML-escaped text with matches in <mark> tags.
+    """
+    params = {"user_id": str(user_id), "limit": limit, "offset": offset}
+    where = filters.sql(params)
+    dialect = engine.dialect.name
+
+    if dialect == "sqlite":
+        match = fts5_query(query)
+        if match is None:
+            return []
+        params.update(match=match, open=_MATCH_OPEN, close=_MATCH_CLOSE)
+        # bm25 is lower-is-better; title hits weigh 10x body hits
+        sql = f"""
+            SELECT {_LIGHT_COLUMNS},
+                   -bm25(document_search_fts, 10.0, 1.0) AS score,
+                   snippet(document_search_fts, 1, :open, :close, '…', 24) AS snippet
+            FROM document_search_fts
+            JOIN document_search s ON s.id = document_search_fts.rowid
+            JOIN documents d ON d.id = s.document_id
+            WHERE document_search_fts MATCH :match AND d.uploaded_by = :user_id{where}
+            ORDER BY bm25(document_search_fts, 10.0, 1.0)
+            LIMIT :limit OFFSET :offset
+        """
+    elif dialect == "postgresql":
+        if not query.strip():
+            return []
+        config = _pg_config()
+        params.update(
+            query=query,
+            headline=f'StartSel="{_MATCH_OPEN}", StopSel="{_MATCH_CLOSE}", MaxWords=35, MinWords=15, MaxFragments=2',
+        )
+        # Headlines are cut only for the page of results, not every match
+        sql = f"""
+            WITH q AS (SELECT websearch_to_tsquery('{config}', :query) AS tsq),
+            hits AS (
+                SELECT s.document_id, s.body, ts_rank_cd(s.tsv, q.tsq) AS score
+                FROM document_search s
+                CROSS JOIN q
+                JOIN documents d ON d.id = s.document_id
+                WHERE s.tsv @@ q.tsq AND d.uploaded_by = :user_id{where}
+                ORDER BY score DESC
+                LIMIT :limit OFFSET :offset
+            )
+            SELECT {_LIGHT_COLUMNS}, hits.score,
+                   ts_headline('{config}', hits.body, q.tsq, :headline) AS snippet
+            FROM hits
+            CROSS JOIN q
+            JOIN documents d ON d.id = hits.document_id
+            ORDER BY hits.score DESC
+        """
+    else:
+        raise NotImplementedError(f"Full-text search is not available on {dialect}")
+
+    columns = Document.__table__.c
+    stmt = text(sql).columns(
+        created_at=columns.created_at.type,
+        extracted_deadline=columns.extracted_deadline.type,
+    )
+    # Date filters bind with the column type so SQLite compares stored strings correctly
+    stmt = stmt.bindparams(*(
+        bindparam(name, type_=columns.created_at.type)
+        for name in ("created_from", "created_to") if name in params
+    ))
+    result = await db.execute(stmt, params)
+    return [{**row._mapping, "snippet": highlight(row.snippet)} for row in result]
@@ -0,0 +1,147 @@
+"""
+Status Events - Push Processing Updates
+
+Workers publish document state transitions and batched OCR progress to the
+Redis channel `docstatus:{user_id}`. Each uvicorn process keeps a single
+pattern subscription and fans events out to its own streaming clients, so
+an event reaches a client whichever process did the work. Without Redis,
+events are delivered within the publishing process only.
+"""
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from app.core import cache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "docstatus:"
+QUEUE_SIZE = 256
+SUBSCRIBE_TIMEOUT = 5  # seconds a new stream waits for the pattern subscription
+
+
+class StatusBroker:
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    async def publish(self, user_id: str, event: dict):
+        client = cache.redis_client
+        if client is not None:
+            try:
+                await client.publish(f"{CHANNEL_PREFIX}{user_id}", json.dumps(event, default=str))
+                return
+            except Exception:
+                logger.warning("Redis publish failed; delivering status event locally")
+        self._dispatch(str(user_id), event)
+
+    async def start(self):
+        """Subscribe to every worker's events (called at startup)"""
+        if cache.redis_client is not None and (self._listener is None or self._listener.done()):
+            self._subscribed.clear()
+            self._listener = asyncio.create_task(self._listen(), name="status-events")
+
+    async def subscribe(self, user_id: str) -> asyncio.Queue:
+        """Queue receiving the user's events (call unsubscribe when done).
+
+        Returns once Redis has confirmed the pattern subscription, so nothing
+        published after this call is missed.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers.setdefault(str(user_id), set()).add(queue)
+        try:
+            await self.start()
+            if self._listener is not None:
+                await asyncio.wait_for(self._subscribed.wait(), timeout=SUBSCRIBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Status event subscription not confirmed; events may be missed")
+        except BaseException:
+            self.unsubscribe(user_id, queue)
+            raise
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(str(user_id))
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[str(user_id)]
+
+    def _dispatch(self, user_id: str, event: dict):
+        for queue in self._subscribers.get(user_id, ()):
+            if queue.full():
+                # Slow client: drop its oldest event rather than block the fan-out
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _listen(self):
+        while True:
+            client = cache.redis_client
+            if client is None:
+                return
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message["type"] == "psubscribe":
+                        self._subscribed.set()
+                        continue
+                    if message["type"] != "pmessage":
+                        continue
+                    user_id = message["channel"][len(CHANNEL_PREFIX):]
+                    if user_id in self._subscribers:
+                        self._dispatch(user_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Status event subscription failed; reconnecting")
+                await asyncio.sleep(1)
+            finally:
+                self._subscribed.clear()
+                await pubsub.reset()
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+broker = StatusBroker()
+
+
+async def publish_status(
+    user_id: str,
+    document_id: str,
+    status: str,
+    pages_done: Optional[int] = None,
+    page_count: Optional[int] = None,
+):
+    """Announce a state transition and orphan the cache entries it makes stale"""
+    namespaces = [cache.document_namespace(document_id), cache.user_namespace(user_id)]
+    if status == "completed":
+        # New text: summaries of the previous run no longer apply
+        namespaces.append(cache.summary_namespace(document_id))
+    await cache.invalidate_namespace(*namespaces)
+    await broker.publish(user_id, {
+        "type": "status",
+        "document_id": str(document_id),
+        "status": status,
+        "pages_done": pages_done,
+        "page_count": page_count,
+    })
+
+
+async def publish_progress(user_id: str, document_id: str, pages_done: int, page_count: int):
+    await broker.publish(user_id, {
+        "type": "progress",
+        "document_id": str(document_id),
+        "status": "processing",
+        "pages_done": pages_done,
+        "page_count": page_count,
+    })
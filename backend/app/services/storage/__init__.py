@@ -0,0 +1,75 @@
+"""
+Storage Backends
+
+`get_storage()` returns the process-wide backend selected by
+STORAGE_BACKEND ("local", "supabase", "s3", or "auto": Supabase when
+credentials are configured, else local). Only "auto" falls back to local
+disk when the remote backend can't be created; an explicit choice raises.
+Backends are created once and shared, so HTTP connection pools survive
+across requests.
+"""
+import logging
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.services.storage.base import StorageBackend
+from app.services.storage.local import LocalStorage
+
+logger = logging.getLogger(__name__)
+
+LOCAL_ROOT = Path(__file__).resolve().parents[3] / "storage"
+
+_local: Optional[LocalStorage] = None
+_backend: Optional[StorageBackend] = None
+
+
+def get_local_storage() -> LocalStorage:
+    global _local
+    if _local is None:
+        _local = LocalStorage(LOCAL_ROOT)
+    return _local
+
+
+def _create_backend() -> StorageBackend:
+    choice = settings.STORAGE_BACKEND
+    auto = choice == "auto"
+    if auto:
+        choice = "supabase" if settings.SUPABASE_URL and settings.SUPABASE_KEY else "local"
+    if choice not in ("local", "supabase", "s3"):
+        raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND!r}")
+
+    try:
+        if choice == "s3":
+            from app.services.storage.s3 import S3Storage
+
+            return S3Storage()
+        if choice == "supabase":
+            from app.services.storage.supabase import SupabaseStorage
+
+            return SupabaseStorage()
+    except Exception as e:
+        # An explicitly configured backend must not silently become local disk
+        if not auto:
+            raise RuntimeError(f"Storage backend {choice!r} could not be created: {e}") from e
+        logger.exception("Storage backend %r unavailable, using local storage", choice)
+    return get_local_storage()
+
+
+def get_storage() -> StorageBackend:
+    """The configured storage backend (shared per process)"""
+    global _backend
+    if _backend is None:
+        _backend = _create_backend()
+    return _backend
+
+
+async def close_storage():
+    """Close pooled connections (application shutdown)"""
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+
+__all__ = ["StorageBackend", "LocalStorage", "LOCAL_ROOT", "get_storage", "get_local_storage", "close_storage"]
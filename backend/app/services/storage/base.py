@@ -0,0 +1,53 @@
+"""
+Storage Backend Interface
+
+Backends address objects by key (e.g. "objects/ab/<sha256>.pdf"). `put_file`
+returns the value to persist in `Document.file_path`: the key for remote
+backends, the absolute path for the local filesystem.
+"""
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Optional
+
+
+class StorageBackend(ABC):
+    name: str = "base"
+
+    @abstractmethod
+    async def exists(self, key: str) -> Optional[str]:
+        """Stored path of the object if it exists, else None"""
+
+    @abstractmethod
+    async def put_file(self, key: str, source: Path, content_type: str) -> str:
+        """Store a local file under `key` (the source may be moved). Returns the stored path."""
+
+    @abstractmethod
+    async def get_bytes(self, path: str) -> bytes:
+        """Whole object in memory (prefer `download_to` for large files)"""
+
+    async def download_to(self, path: str, fileobj: BinaryIO):
+        """Write the object into a seekable binary file object"""
+        fileobj.write(await self.get_bytes(path))
+
+    @abstractmethod
+    async def stream(
+        self,
+        path: str,
+        range_header: Optional[str] = None,
+    ) -> tuple[int, dict, AsyncIterator[bytes]]:
+        """(status, headers, body) for a download, honouring a Range header.
+
+        The body of an error status must not hold a connection open, as
+        callers may discard it without iterating.
+        """
+
+    @abstractmethod
+    async def delete(self, path: str):
+        """Delete the object (missing objects are ignored)"""
+
+    def local_path(self, path: str) -> Optional[Path]:
+        """Filesystem path if the object is on local disk"""
+        return None
+
+    async def close(self):
+        """Release pooled connections"""
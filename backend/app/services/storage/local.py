@@ -0,0 +1,59 @@
+"""
+Local Filesystem Storage (dev / single node)
+"""
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import aiofiles
+import aiofiles.os
+
+from app.services.storage.base import StorageBackend
+
+CHUNK_SIZE = 256 * 1024
+
+
+class LocalStorage(StorageBackend):
+    name = "local"
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    async def exists(self, key: str) -> Optional[str]:
+        path = self.root / key
+        return str(path) if await aiofiles.os.path.exists(path) else None
+
+    async def put_file(self, key: str, source: Path, content_type: str) -> str:
+        path = self.root / key
+        await aiofiles.os.makedirs(path.parent, exist_ok=True)
+        await aiofiles.os.replace(source, path)  # atomic, so readers never see a partial object
+        return str(path)
+
+    async def get_bytes(self, path: str) -> bytes:
+        async with aiofiles.open(path, "rb") as f:
+            return await f.read()
+
+    async def stream(
+        self,
+        path: str,
+        range_header: Optional[str] = None,
+    ) -> tuple[int, dict, AsyncIterator[bytes]]:
+        # Ranged local downloads are served by RangeFileResponse; this is the plain path
+        size = (await aiofiles.os.stat(path)).st_size
+
+        async def body() -> AsyncIterator[bytes]:
+            async with aiofiles.open(path, "rb") as f:
+                while chunk := await f.read(CHUNK_SIZE):
+                    yield chunk
+
+        return 200, {"content-length": str(size)}, body()
+
+    async def delete(self, path: str):
+        try:
+            await asyncio.to_thread(Path(path).unlink, missing_ok=True)
+        except OSError:
+            pass
+
+    def local_path(self, path: str) -> Optional[Path]:
+        candidate = Path(path)
+        return candidate if candidate.is_file() else None
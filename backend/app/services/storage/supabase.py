@@ -0,0 +1,104 @@
+"""
+Supabase Storage Backend
+
+One SDK client per process (created lazily); downloads are proxied through a
+shared httpx client so connections are reused across requests.
+"""
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from urllib.parse import quote
+
+import httpx
+
+from app.core.config import settings
+from app.services.storage.base import StorageBackend
+
+# Headers relayed from Supabase when proxying a download
+_PROXY_HEADERS = ("content-length", "content-range", "content-type")
+
+
+class SupabaseStorage(StorageBackend):
+    name = "supabase"
+
+    def __init__(self):
+        from supabase import create_client  # type: ignore
+
+        self.bucket_name = settings.SUPABASE_BUCKET
+        self.client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        self.http = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, read=120.0),
+            limits=httpx.Limits(max_connections=settings.STORAGE_MAX_CONNECTIONS),
+        )
+
+    @property
+    def bucket(self):
+        return self.client.storage.from_(self.bucket_name)
+
+    async def exists(self, key: str) -> Optional[str]:
+        folder, _, name = key.rpartition("/")
+        existing = await asyncio.to_thread(self.bucket.list, folder, {"search": name})
+        if any(item.get("name") == name for item in existing or []):
+            return key
+        return None
+
+    async def put_file(self, key: str, source: Path, content_type: str) -> str:
+        # The SDK streams a path as the request body
+        await asyncio.to_thread(
+            self.bucket.upload,
+            key,
+            str(source),
+            file_options={"content-type": content_type},
+        )
+        return key
+
+    async def get_bytes(self, path: str) -> bytes:
+        return await asyncio.to_thread(self.bucket.download, path)
+
+    async def stream(
+        self,
+        path: str,
+        range_header: Optional[str] = None,
+    ) -> tuple[int, dict, AsyncIterator[bytes]]:
+        url = (
+            f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1/object/authenticated/"
+            f"{self.bucket_name}/{quote(path)}"
+        )
+        headers = {
+            "Authorization": f"Bearer {settings.SUPABASE_KEY}",
+            "apikey": settings.SUPABASE_KEY,
+            "Accept-Encoding": "identity",  # relay bytes as stored so ranges stay valid
+        }
+        if range_header:
+            headers["Range"] = range_header
+
+        response = await self.http.send(self.http.build_request("GET", url, headers=headers), stream=True)
+        relayed = {k: response.headers[k] for k in _PROXY_HEADERS if k in response.headers}
+
+        if response.status_code >= 400:
+            # Error bodies are small: read and release the connection now, since
+            # callers may raise without ever iterating the body
+            try:
+                content = await response.aread()
+            finally:
+                await response.aclose()
+            return response.status_code, relayed, _chunks(content)
+
+        async def body() -> AsyncIterator[bytes]:
+            try:
+                async for chunk in response.aiter_raw():
+                    yield chunk
+            finally:
+                await response.aclose()
+
+        return response.status_code, relayed, body()
+
+    async def delete(self, path: str):
+        await asyncio.to_thread(self.bucket.remove, [path])
+
+    async def close(self):
+        await self.http.aclose()
+
+
+async def _chunks(content: bytes) -> AsyncIterator[bytes]:
+    yield content
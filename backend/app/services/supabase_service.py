@@ -1,78 +1,183 @@
 """
-Supabase Service - Cloud File Storage
+Supabase Service - File Storage
+
+Facade over the configured storage backend (see app.services.storage):
+local disk, Supabase or any S3-compatible store. The backend is shared per
+process, so no client is built per request.
+
+Uploads are content-addressed: objects are stored under their SHA-256, so a
+re-uploaded file reuses the object that is already there.
+
+Uploads are streamed in chunks to a spool file under storage/tmp (aiofiles),
+computing size, SHA-256 and the sniffed MIME type in the same pass; no
+upload is ever held in memory whole. The request body of a single upload
+is capped while it arrives (BodySizeLimitMiddleware); the checks here apply
+the exact per-file limit, including to ZIP entries. The backend then stores the spool file (renamed locally,
+multipart or streamed remotely).
 """
 from fastapi import UploadFile
-from uuid import UUID
+from uuid import UUID, uuid4
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, Optional
+import aiofiles
+import aiofiles.os
 import asyncio
+import hashlib
+import zipfile
 from pathlib import Path
 
 from app.core.config import settings
+from app.core.monitoring import DEDUP_HITS
+from app.services.storage import LOCAL_ROOT, StorageBackend, get_local_storage, get_storage
+
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Magic numbers for the types the pipeline processes; anything else keeps the
+# client's type (a ZIP signature is also docx/xlsx, "BM" may be plain text)
+_MAGIC = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+class FileTooLargeError(ValueError):
+    """Upload exceeded MAX_UPLOAD_SIZE"""
+
+
+@dataclass
+class StoredFile:
+    path: str
+    size: int
+    sha256: str
+    content_type: str
+    reused: bool = False  # object already existed in storage
+
+
+def sniff_content_type(head: bytes, fallback: Optional[str] = None) -> str:
+    """MIME type from the first bytes of a file"""
+    for magic, content_type in _MAGIC:
+        if head.startswith(magic):
+            return content_type
+    return fallback or "application/octet-stream"
+
+
+async def iter_upload(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read an UploadFile in chunks"""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def iter_zip_entry(
+    archive: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Decompress one ZIP entry in chunks, without extracting it to disk.
+
+    ZipFile serialises access to the underlying file, so several entries of
+    the same archive can be streamed concurrently.
+    """
+    entry = await asyncio.to_thread(archive.open, info)
+    try:
+        while chunk := await asyncio.to_thread(entry.read, chunk_size):
+            yield chunk
+    finally:
+        entry.close()
 
 
 class SupabaseService:
     def __init__(self):
-        self.bucket = settings.SUPABASE_BUCKET
-        self.local_root = Path(__file__).resolve().parents[2] / "storage"
+        self.local_root = LOCAL_ROOT
+        self.backend = get_storage()
+        self.local = get_local_storage()
+    
+    def _backend_for(self, file_path: str) -> StorageBackend:
+        """Files written before a remote backend was configured stay on local disk"""
+        if file_path.startswith(str(self.local_root)):
+            return self.local
+        return self.backend
+
+    @property
+    def remote_enabled(self) -> bool:
+        return self.backend is not self.local
+    
+    async def upload_file(self, file: UploadFile, user_id: UUID) -> StoredFile:
+        """Upload file to storage (streamed, deduplicated by content hash)"""
+        # The form is already parsed here; oversized request bodies are refused
+        # earlier by BodySizeLimitMiddleware, this enforces the exact file size
+        if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+            raise FileTooLargeError(file.filename)
 
-        # Optional dependency: if supabase isn't installed or creds missing, we fall back to local storage.
-        self._supabase_ok = False
-        self.client = None
+        return await self.store_stream(iter_upload(file), file.filename, file.content_type)
+
+    async def store_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: Optional[str],
+        content_type: Optional[str] = None,
+    ) -> StoredFile:
+        """Store a stream of chunks, computing size, hash and MIME type in one pass"""
+        spool_dir = self.local_root / "tmp"
+        await aiofiles.os.makedirs(spool_dir, exist_ok=True)
+        spool_path = spool_dir / f"{uuid4().hex}.part"
+
+        digest = hashlib.sha256()
+        size = 0
+        head = b""
         try:
-            if settings.SUPABASE_URL and settings.SUPABASE_KEY:
-                from supabase import create_client  # type: ignore
+            async with aiofiles.open(spool_path, "wb") as out:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > settings.MAX_UPLOAD_SIZE:
+                        raise FileTooLargeError(filename)
+                    if len(head) < 16:
+                        head = (head + chunk)[:16]
+                    digest.update(chunk)
+                    await out.write(chunk)
+
+            sha256 = digest.hexdigest()
+            sniffed = sniff_content_type(head, content_type)
+            key = f"objects/{sha256[:2]}/{sha256}{Path(filename or '').suffix.lower()}"
+
+            existing = await self.backend.exists(key)
+            if existing:
+                DEDUP_HITS.labels(stage="storage").inc()
+                return StoredFile(path=existing, size=size, sha256=sha256, content_type=sniffed, reused=True)
+
+            stored = await self.backend.put_file(key, spool_path, sniffed)
+            return StoredFile(path=stored, size=size, sha256=sha256, content_type=sniffed)
+        finally:
+            await asyncio.to_thread(spool_path.unlink, missing_ok=True)
+
+    def local_path(self, file_path: str) -> Optional[Path]:
+        """Filesystem path of a locally stored file (None if it lives in remote storage)"""
+        return self._backend_for(file_path).local_path(file_path)
 
-                self.client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-                self._supabase_ok = True
-        except Exception:
-            self._supabase_ok = False
-    
-    async def upload_file(self, file: UploadFile, user_id: UUID) -> str:
-        """Upload file to Supabase storage"""
-        file_path = f"{user_id}/{file.filename}"
-        
-        # Read file content
-        content = await file.read()
-
-        if self._supabase_ok and self.client is not None:
-            # Upload to Supabase
-            await asyncio.to_thread(
-                self.client.storage.from_(self.bucket).upload,
-                file_path,
-                content,
-                file_options={"content-type": file.content_type or "application/octet-stream"},
-            )
-            return file_path
-
-        # Local fallback (dev): store file under backend/storage/<user_id>/<filename>
-        target = self.local_root / str(user_id)
-        target.mkdir(parents=True, exist_ok=True)
-        out_path = target / (file.filename or "upload.bin")
-        out_path.write_bytes(content)
-        return str(out_path)
-    
     async def download_file(self, file_path: str) -> bytes:
-        """Download file from Supabase storage"""
-        if self._supabase_ok and self.client is not None and not file_path.startswith(str(self.local_root)):
-            result = await asyncio.to_thread(
-                self.client.storage.from_(self.bucket).download,
-                file_path,
-            )
-            return result
-
-        # Local fallback
-        return Path(file_path).read_bytes()
+        """Download a whole file into memory"""
+        return await self._backend_for(file_path).get_bytes(file_path)
+
+    async def download_to(self, file_path: str, fileobj: BinaryIO):
+        """Download a file into a seekable file object (parallel ranged reads on S3)"""
+        await self._backend_for(file_path).download_to(file_path, fileobj)
     
+    async def stream_download(
+        self,
+        file_path: str,
+        range_header: Optional[str] = None,
+    ) -> tuple[int, dict, AsyncIterator[bytes]]:
+        """Proxy a remote object as a stream, forwarding the Range header.
+
+        Returns (status, headers, body iterator); the upstream connection is
+        released when the iterator finishes, or before returning on an
+        error status.
+        """
+        return await self._backend_for(file_path).stream(file_path, range_header)
+
     async def delete_file(self, file_path: str):
-        """Delete file from Supabase storage"""
-        if self._supabase_ok and self.client is not None and not file_path.startswith(str(self.local_root)):
-            await asyncio.to_thread(
-                self.client.storage.from_(self.bucket).remove,
-                [file_path],
-            )
-            return
-
-        # Local fallback
-        try:
-            Path(file_path).unlink(missing_ok=True)
-        except Exception:
-            pass
+        """Delete file from storage"""
+        await self._backend_for(file_path).delete(file_path)
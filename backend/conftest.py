@@ -0,0 +1 @@
+"""pytest rootdir: puts backend/ on sys.path so tests import the `app` package"""
@@ -0,0 +1,48 @@
+"""
+BodySizeLimitMiddleware against a bare Starlette app.
+
+    cd backend && pytest
+"""
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.middleware import BodySizeLimitMiddleware
+
+
+async def _echo_size(request):
+    body = await request.body()
+    return PlainTextResponse(str(len(body)))
+
+
+def _client(limit: int) -> TestClient:
+    app = Starlette(routes=[Route("/upload", _echo_size, methods=["POST"]), Route("/other", _echo_size, methods=["POST"])])
+    return TestClient(BodySizeLimitMiddleware(app, max_body_size=limit, detail="too big"))
+
+
+def test_body_within_limit_passes():
+    response = _client(10).post("/upload", content=b"x" * 10)
+    assert response.status_code == 200
+    assert response.text == "10"
+
+
+def test_declared_length_over_limit_is_refused():
+    response = _client(10).post("/upload", content=b"x" * 11)
+    assert response.status_code == 413
+    assert response.json() == {"detail": "too big"}
+
+
+def test_streamed_body_over_limit_is_cut_off():
+    def chunks():
+        for _ in range(5):
+            yield b"x" * 4
+
+    # A generator body is sent chunked, without Content-Length
+    response = _client(10).post("/upload", content=chunks())
+    assert response.status_code == 413
+
+
+def test_other_paths_are_not_limited():
+    response = _client(10).post("/other", content=b"x" * 11)
+    assert response.status_code == 200
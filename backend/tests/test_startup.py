@@ -0,0 +1,31 @@
+"""
+Startup smoke test: the app imports and starts against the default
+file-backed SQLite configuration.
+
+    cd backend && pytest
+"""
+import importlib
+import sys
+
+from fastapi.testclient import TestClient
+
+
+def _load_app(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'smoke.db'}")
+    monkeypatch.setenv("ENABLE_CACHE", "false")
+    monkeypatch.setenv("WORKER_ENABLED", "false")
+    monkeypatch.setenv("STORAGE_BACKEND", "local")
+    # Settings and engines are built at import time
+    for name in [m for m in sys.modules if m == "app" or m.startswith("app.")]:
+        del sys.modules[name]
+    return importlib.import_module("app.main").app
+
+
+def test_app_starts_with_file_sqlite(monkeypatch, tmp_path):
+    app = _load_app(monkeypatch, tmp_path)
+    # Entering the client runs the lifespan: engines, init_db, storage, monitoring
+    with TestClient(app) as client:
+        response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
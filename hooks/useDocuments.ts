@@ -14,16 +14,18 @@ export interface Document {
 
 export interface DocumentsResponse {
   items: Document[]
-  total: number
-  skip: number
+  next_cursor: string | null
   limit: number
+  total?: number
 }
 
 export function useDocuments() {
   return useQuery<DocumentsResponse>({
     queryKey: ['documents'],
     queryFn: async () => {
-      const { data } = await api.get<DocumentsResponse>('/documents')
+      const { data } = await api.get<DocumentsResponse>('/documents', {
+        params: { include_total: true, include: 'summary' },
+      })
       return data
     },
   })